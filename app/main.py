@@ -14,7 +14,7 @@ from fastapi.staticfiles import StaticFiles
 
 from app.config import get_settings
 from app.database import init_db
-from app.routers import enterprises, tenders, analyses
+from app.routers import enterprises, tenders, analyses, reports
 from app.scheduler.jobs import init_scheduler, shutdown_scheduler
 
 # Configuration du logging
@@ -122,6 +122,7 @@ async def global_exception_handler(request: Request, exc: Exception):
 app.include_router(enterprises.router, prefix="/api/v1")
 app.include_router(tenders.router, prefix="/api/v1")
 app.include_router(analyses.router, prefix="/api/v1")
+app.include_router(reports.router, prefix="/api/v1")
 
 
 # === Endpoints utilitaires ===
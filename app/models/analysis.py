@@ -5,7 +5,7 @@ Modèle Analysis - Résultats d'analyse IA des appels d'offres
 
 from datetime import datetime
 from sqlalchemy import (
-    Column, Integer, Float, DateTime, Text, ForeignKey
+    Column, Integer, Float, DateTime, Text, ForeignKey, Index
 )
 from sqlalchemy.orm import relationship
 from app.database import Base
@@ -13,6 +13,10 @@ from app.database import Base
 
 class Analysis(Base):
     __tablename__ = "analyses"
+    __table_args__ = (
+        # Classement des analyses par entreprise
+        Index("ix_analyses_enterprise_id_score", "enterprise_id", "score"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     tender_id = Column(
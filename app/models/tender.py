@@ -5,19 +5,24 @@ Modèle Tender - Appels d'offres scrapés
 
 from datetime import datetime
 from sqlalchemy import (
-    Column, Integer, String, Float, DateTime, Text, Boolean
+    Column, Integer, String, Float, DateTime, Text, Boolean, Index
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 from app.database import Base
 
 
 class Tender(Base):
     __tablename__ = "tenders"
+    __table_args__ = (
+        # Chargement des tenders analyses pour le scoring
+        Index("ix_tenders_is_analyzed_id", "is_analyzed", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     title = Column(String(500), nullable=False, index=True)
     description = Column(Text, nullable=True)
-    raw_text = Column(Text, nullable=True, comment="Texte brut extrait du PDF")
+    # Colonne volumineuse chargee a la demande (voir undefer() dans les requetes qui la lisent)
+    raw_text = deferred(Column(Text, nullable=True, comment="Texte brut extrait du PDF"))
     sector = Column(String(255), nullable=True, index=True)
     estimated_budget = Column(Float, nullable=True)
     location = Column(String(255), nullable=True)
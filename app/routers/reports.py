@@ -0,0 +1,84 @@
+# app/routers/reports.py
+"""
+Endpoints pour la generation asynchrone des rapports PDF
+
+Les jobs sont suivis en memoire dans le processus qui les a crees : un job id
+n'est valable que dans ce worker (le Dockerfile lance uvicorn avec --workers 1)
+et expire PDF_JOB_TTL secondes apres la fin du rendu.
+"""
+
+import logging
+import os
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import FileResponse
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.models.enterprise import Enterprise
+from app.services.report_generator import enqueue_pdf_report, get_pdf_job
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/reports",
+    tags=["Rapports"],
+)
+
+
+@router.post(
+    "/enterprises/{enterprise_id}/pdf",
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Lancer la generation du rapport PDF",
+)
+def enqueue_enterprise_pdf(
+    enterprise_id: int,
+    db: Session = Depends(get_db),
+):
+    """POST /reports/enterprises/{id}/pdf - Retourne un job id, le rendu se fait en arriere-plan"""
+    enterprise = db.query(Enterprise).get(enterprise_id)
+    if not enterprise:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Entreprise #{enterprise_id} non trouvee")
+
+    plan = (enterprise.subscription_plan or "ENTRY").upper()
+    job_id = enqueue_pdf_report(enterprise_id, subscription_plan=plan)
+    return {
+        "job_id": job_id,
+        "status_url": f"/api/v1/reports/{job_id}/status",
+        "download_url": f"/api/v1/reports/{job_id}/download",
+    }
+
+
+@router.get(
+    "/{job_id}/status",
+    summary="Statut d'un job PDF",
+)
+def get_report_status(job_id: str):
+    """GET /reports/{job_id}/status"""
+    job = get_pdf_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Job {job_id} inconnu")
+    job_status, _ = job
+    return {"job_id": job_id, "status": job_status}
+
+
+@router.get(
+    "/{job_id}/download",
+    summary="Telecharger le PDF d'un job termine",
+)
+def download_report(job_id: str):
+    """GET /reports/{job_id}/download"""
+    job = get_pdf_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Job {job_id} inconnu")
+    job_status, pdf_path = job
+    if job_status in ("pending", "running"):
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Job {job_id} en cours ({job_status})")
+    if not pdf_path or not os.path.exists(pdf_path):
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Erreur génération du PDF")
+
+    return FileResponse(
+        path=pdf_path,
+        media_type="application/pdf",
+        filename=os.path.basename(pdf_path),
+        headers={"Content-Disposition": f"attachment; filename={os.path.basename(pdf_path)}"},
+    )
@@ -99,7 +99,7 @@ def download_enterprise_pdf(
     recommendations = None
     try:
         scorer = ScorerService(db)
-        scored_list = scorer.score_all_for_enterprise(enterprise)
+        scored_list = scorer.score_all_for_enterprise(enterprise, top_k=5)
         analyzer = AIAnalyzerService(db)
         recommendations = analyzer.generate_budget_recommendations(enterprise, scored_list[:5])
     except Exception as e:
@@ -135,6 +135,7 @@ def job_elite_realtime_alert():
             logger.info(f"ELITE RT: {len(elite_enterprises)} clients ELITE a alerter")
 
             scorer = ScorerService(db)
+            scorer.preload_tenders()
             email_service = EmailService(db)
             alerts_sent: int = 0
 
@@ -12,7 +12,7 @@ from datetime import datetime
 
 from openai import OpenAI, RateLimitError  # SDK compatible avec Groq
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, undefer
 
 from app.config import get_settings
 from app.models.tender import Tender
@@ -257,7 +257,7 @@ JSON :"""
         Analyse tous les tenders non encore analyses.
         Traitement par batch avec pause pour respecter le rate limit Groq.
         """
-        pending_tenders = self.db.query(Tender).filter(
+        pending_tenders = self.db.query(Tender).options(undefer(Tender.raw_text)).filter(
             Tender.is_analyzed == False  # noqa: E712
         ).all()
 
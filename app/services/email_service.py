@@ -12,8 +12,10 @@ import os
 import re
 import unicodedata
 from datetime import datetime
+from urllib.parse import quote_plus
 
 import requests
+from requests.adapters import HTTPAdapter
 from tenacity import retry, stop_after_attempt, wait_exponential
 from sqlalchemy.orm import Session
 
@@ -26,6 +28,41 @@ from app.models.email_log import EmailLog
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Rapports quotidiens : entreprises dont les PDF sont rendus ensemble (processus paralleles)
+PDF_BATCH_SIZE = 50
+
+# Session HTTP partagee : keep-alive vers l'API Mailjet (evite un handshake TLS par envoi)
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(max_retries=0, pool_connections=4, pool_maxsize=16))
+_SESSION.headers.update({"Content-Type": "application/json"})
+
+# Sequences de double-encodage UTF-8 -> caractere correct (une entree par sequence)
+_MOJIBAKE_TABLE = {
+    'Ã©': 'é', 'Ã¨': 'è', 'Ãª': 'ê', 'Ã«': 'ë',
+    'Ã\u00a0': 'à', 'Ã¢': 'â', 'Ã§': 'ç', 'Ã´': 'ô',
+    'Ã¹': 'ù', 'Ã»': 'û', 'Ã®': 'î', 'Ã¯': 'ï',
+    'Ã ': 'à',  # variante ou l'espace insecable est devenu une espace
+    'â\x80\x99': "'", 'â\x80\x93': '-', 'â\x80\x94': '-',
+    '\u2019': "'",
+}
+# Detecte en une passe si au moins une sequence du tableau est presente
+_MOJIBAKE_PAT = re.compile("|".join(re.escape(k) for k in sorted(_MOJIBAKE_TABLE, key=len, reverse=True)))
+
+# Paliers de score : (seuil, couleur, libelle, fond du badge, texte du badge)
+_SCORE_BUCKETS = (
+    (70, "#27ae60", "Excellent", "#e8f5e9", "#1b5e20"),
+    (40, "#f39c12", "Moyen", "#fff8e1", "#e65100"),
+    (0, "#e74c3c", "A surveiller", "#fce4ec", "#b71c1c"),
+)
+
+
+def _score_bucket(score: float) -> tuple:
+    """Retourne le palier (seuil, couleur, libelle, fond, texte) d'un score."""
+    for bucket in _SCORE_BUCKETS:
+        if score >= bucket[0]:
+            return bucket
+    return _SCORE_BUCKETS[-1]
+
 
 class EmailService:
     """Service d'envoi d'emails via API HTTP Mailjet"""
@@ -69,19 +106,10 @@ class EmailService:
         except (UnicodeDecodeError, UnicodeEncodeError):
             pass
         
-        replacements = {
-            '\u00c3\u00a9': 'é', '\u00c3\u00a8': 'è', '\u00c3\u00aa': 'ê',
-            '\u00c3\u00ab': 'ë', '\u00c3\u00a0': 'à', '\u00c3\u00a2': 'â',
-            '\u00c3\u00a7': 'ç', '\u00c3\u00b4': 'ô', '\u00c3\u00b9': 'ù',
-            '\u00c3\u00bb': 'û', '\u00c3\u00ae': 'î', '\u00c3\u00af': 'ï',
-            'Ã©': 'é', 'Ã¨': 'è', 'Ãª': 'ê', 'Ã«': 'ë',
-            'Ã ': 'à', 'Ã¢': 'â', 'Ã§': 'ç', 'Ã´': 'ô',
-            'Ã¹': 'ù', 'Ã»': 'û', 'Ã®': 'î', 'Ã¯': 'ï',
-            'â\x80\x99': "'", 'â\x80\x93': '-', 'â\x80\x94': '-',
-            '\u2019': "'", '\u00e2\u0080\u0099': "'",
-        }
-        for bad, good in replacements.items():
-            text = text.replace(bad, good)
+        # Remplacements (dans l'ordre du tableau) uniquement si une sequence est presente
+        if _MOJIBAKE_PAT.search(text):
+            for bad, good in _MOJIBAKE_TABLE.items():
+                text = text.replace(bad, good)
         return text
 
     def _clean_text(self, text: str) -> str:
@@ -125,12 +153,12 @@ class EmailService:
         has_pdf: bool = False,
     ) -> str:
         """Construit le corps HTML de l'email - Design premium."""
-        tender_rows = ""
+        tender_rows_parts = []
         text_lines = []
 
         for item in scored_analyses[:10]:
             score = item["score"]
-            score_color = "#27ae60" if score >= 70 else "#f39c12" if score >= 40 else "#e74c3c"
+            _, score_color, level_label, level_bg, level_txt = _score_bucket(score)
             source_url = item.get('source_url', '')
             clean_title = self._clean_text(item['tender_title'][:80])
             clean_summary = self._clean_text(item.get('summary', '')[:200])
@@ -138,15 +166,10 @@ class EmailService:
             if source_url and source_url.startswith('http'):
                 btn_url = source_url
             else:
-                import urllib.parse
-                search_query = urllib.parse.quote_plus(self._clean_plain_text(item['tender_title'][:100]))
+                search_query = quote_plus(self._clean_plain_text(item['tender_title'][:100]))
                 btn_url = f"https://www.google.com/search?q={search_query}+appel+d%27offres+Guinee"
 
-            level_label = "Excellent" if score >= 70 else "Moyen" if score >= 40 else "A surveiller"
-            level_bg = "#e8f5e9" if score >= 70 else "#fff8e1" if score >= 40 else "#fce4ec"
-            level_txt = "#1b5e20" if score >= 70 else "#e65100" if score >= 40 else "#b71c1c"
-
-            tender_rows += f"""
+            tender_rows_parts.append(f"""
             <table width="100%" cellpadding="0" cellspacing="0" style="margin-bottom:18px;background:#ffffff;border-radius:16px;border:1px solid #eaedf2;overflow:hidden;box-shadow:0 4px 12px rgba(0,0,0,0.05);">
               <tr>
                 <td width="88" style="padding:24px 0 24px 16px;vertical-align:top;text-align:center;">
@@ -162,17 +185,18 @@ class EmailService:
                   <a href="{btn_url}" target="_blank" style="display:inline-block;background:#0d1117;color:#ffffff;padding:10px 24px;border-radius:100px;text-decoration:none;font-size:13px;font-weight:600;font-family:-apple-system,BlinkMacSystemFont,sans-serif;-webkit-font-smoothing:antialiased;">Voir l'offre &rarr;</a>
                 </td>
               </tr>
-            </table>"""
+            </table>""")
             text_lines.append(f"- {self._clean_plain_text(item['tender_title'][:80])} (Score: {score:.0f}/100)")
 
+        tender_rows = "".join(tender_rows_parts)
         self._text_summary = "\n".join(text_lines) if text_lines else "Aucun appel d'offres correspondant."
 
         reco_section = ""
         if recommendations:
-            reco_items = ""
+            reco_items_parts = []
             for i, reco in enumerate(recommendations or [], 1):
                 clean_reco = self._clean_text(reco)
-                reco_items += f"""
+                reco_items_parts.append(f"""
                 <tr><td style="padding:12px 0;border-bottom:1px solid #f0f2f8;">
                   <table cellpadding="0" cellspacing="0" width="100%"><tr>
                     <td width="32" style="vertical-align:top;padding-top:1px;">
@@ -182,7 +206,8 @@ class EmailService:
                     </td>
                     <td style="padding-left:10px;font-size:13px;color:#374151;line-height:1.6;font-family:-apple-system,BlinkMacSystemFont,sans-serif;">{clean_reco}</td>
                   </tr></table>
-                </td></tr>"""
+                </td></tr>""")
+            reco_items = "".join(reco_items_parts)
             reco_section = f"""<table width="100%" cellpadding="0" cellspacing="0" style="margin-top:12px;background:#fafbff;border-radius:16px;border:1px solid #e0e4ff;overflow:hidden;">
               <tr><td style="padding:22px 24px 4px 24px;">
                 <p style="margin:0 0 4px 0;font-size:11px;font-weight:700;text-transform:uppercase;letter-spacing:1px;color:#6366f1;font-family:-apple-system,BlinkMacSystemFont,sans-serif;">Intelligence artificielle</p>
@@ -284,7 +309,7 @@ class EmailService:
                 logger.error(f"Erreur preparation PDF: {e}")
 
         try:
-            response = requests.post(api_url, json=payload, auth=auth, timeout=30)
+            response = _SESSION.post(api_url, json=payload, auth=auth, timeout=30)
             response.raise_for_status()
             logger.info(f"Email envoye via API Mailjet a {to_email}")
             return True
@@ -380,18 +405,42 @@ class EmailService:
             self.db.commit()
             return False
 
+    def _iter_enterprises(self, batch_size: int = 200):
+        """
+        Parcourt les entreprises avec email par lots (pagination par id).
+        Evite de charger toute la table en memoire ; contrairement a un curseur
+        serveur (yield_per/stream_results), reste valide malgre les commits
+        effectues pendant l'envoi de chaque rapport.
+        """
+        last_id = 0
+        while True:
+            batch = (
+                self.db.query(Enterprise)
+                .filter(Enterprise.email.isnot(None), Enterprise.id > last_id)
+                .order_by(Enterprise.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not batch:
+                return
+            last_id = batch[-1].id
+            yield from batch
+
     def send_all_daily_reports(self) -> dict:
         from datetime import timedelta
         from app.services.scorer import ScorerService
         from app.services.ai_analyzer import AIAnalyzerService
         from app.services.report_generator import ReportGeneratorService
 
-        enterprises = self.db.query(Enterprise).filter(Enterprise.email.isnot(None)).all()
+        enterprises = self._iter_enterprises()
         scorer = ScorerService(self.db)
+        scorer.preload_tenders()
         ai_service = AIAnalyzerService(self.db)
-        report_service = ReportGeneratorService(self.db)
+        report_service = ReportGeneratorService(self.db, scorer=scorer)  # Partage les tenders prechargés
         
         results = {"sent": 0, "failed": 0, "skipped": 0}
+        # Entreprises scorees dont le PDF et l'email restent a traiter
+        pending: list[tuple] = []
 
         for enterprise in enterprises:
             try:
@@ -416,9 +465,15 @@ class EmailService:
                     results["skipped"] += 1
                     continue
 
+                # Resumes en une seule requete (tender_id est unique dans analyses)
+                summaries = dict(
+                    self.db.query(Analysis.tender_id, Analysis.summary).filter(
+                        Analysis.tender_id.in_([item["tender_id"] for item in scored])
+                    )
+                )
                 for item in scored:
-                    analysis = self.db.query(Analysis).filter(Analysis.tender_id == item["tender_id"]).first()
-                    if analysis: item["summary"] = analysis.summary or ""
+                    if item["tender_id"] in summaries:
+                        item["summary"] = summaries[item["tender_id"]] or ""
                 
                 # Recommandations IA adaptees au plan
                 reco = None
@@ -429,17 +484,39 @@ class EmailService:
                 except Exception:
                     pass
 
-                pdf_path = None
-                try:
-                    pdf_path = report_service.generate_pdf_report(
-                        enterprise.id, recommendations=reco, subscription_plan=plan
-                    )
-                except Exception:
-                    pass
+                pending.append((enterprise, plan, scored, reco))
+                if len(pending) >= PDF_BATCH_SIZE:
+                    self._send_report_batch(report_service, pending, results)
+            except Exception:
+                results["failed"] += 1
+
+        self._send_report_batch(report_service, pending, results)
+        return results
+
+    def _send_report_batch(self, report_service, pending: list[tuple], results: dict) -> None:
+        """
+        Rend en parallele les PDF d'un lot d'entreprises deja scorees
+        (generate_pdf_reports_batch), puis envoie leurs rapports. Vide `pending`.
+        """
+        if not pending:
+            return
+        pdf_paths = {}
+        try:
+            pdf_paths = report_service.generate_pdf_reports_batch(
+                [enterprise.id for enterprise, _, _, _ in pending],
+                recommendations={enterprise.id: reco for enterprise, _, _, reco in pending},
+                subscription_plans={enterprise.id: plan for enterprise, plan, _, _ in pending},
+                scored={enterprise.id: scored for enterprise, _, scored, _ in pending},
+            )
+        except Exception as e:
+            logger.error(f"Erreur generation des PDF du lot: {e}")
 
-                success = self.send_daily_report(enterprise, scored, recommendations=reco, pdf_path=pdf_path)
+        for enterprise, _, scored, reco in pending:
+            try:
+                success = self.send_daily_report(
+                    enterprise, scored, recommendations=reco, pdf_path=pdf_paths.get(enterprise.id)
+                )
                 results["sent" if success else "failed"] += 1
             except Exception:
                 results["failed"] += 1
-
-        return results
\ No newline at end of file
+        pending.clear()
\ No newline at end of file
@@ -1,9 +1,16 @@
 import os
 import re
 import html
+import io
 import logging
+import multiprocessing
+import threading
+import time
 import unicodedata
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 
 from sqlalchemy.orm import Session
 
@@ -17,41 +24,278 @@ logger = logging.getLogger(__name__)
 REPORTS_DIR = os.path.join("downloads", "reports")
 os.makedirs(REPORTS_DIR, exist_ok=True)
 
+_MOJIBAKE_TABLE = {
+    'Ã©': 'é', 'Ã¨': 'è', 'Ãª': 'ê', 'Ã«': 'ë', 'Ã ': 'à', 'Ã¢': 'â', 'Ã§': 'ç', 'Ã´': 'ô',
+    'Ã¹': 'ù', 'Ã»': 'û', 'Ã®': 'î', 'Ã¯': 'ï', 'Ã\x89': 'É', 'Ã\x80': 'À', 'Ã\x94': 'Ô',
+    'â\x80\x99': "'", 'â\x80\x93': '-', 'â\x80\x94': '-', 'â\x80\xa6': '...',
+    'd\u00e2\u0080\u0099': "d'", 'l\u00e2\u0080\u0099': "l'",
+    'd\u00e2': "d'", 'l\u00e2': "l'", 'n\u00e2': "n'",
+}
+# Detecte en une passe si au moins une sequence du tableau est presente
+_MOJIBAKE_PAT = re.compile("|".join(re.escape(k) for k in sorted(_MOJIBAKE_TABLE, key=len, reverse=True)))
+_MOJIBAKE_RE = re.compile(r'Ã([\u00a0-\u00bf])')
+_NON_LATIN_RE = re.compile(r'[^\x00-\x7F\xc0-\xff]+')
+
+
+@lru_cache(maxsize=8192)
+def _fix_encoding(text: str) -> str:
+    if not text:
+        return ""
+    try:
+        fixed = text.encode('latin-1').decode('utf-8')
+        if fixed != text: return fixed
+    except (UnicodeDecodeError, UnicodeEncodeError):
+        pass
+    # Remplacements en cascade (l'ordre compte) uniquement si une sequence est presente
+    if _MOJIBAKE_PAT.search(text):
+        for bad, good in _MOJIBAKE_TABLE.items():
+            text = text.replace(bad, good)
+    text = _MOJIBAKE_RE.sub(lambda m: (chr(ord(m.group(1)) + 64)).encode('latin-1').decode('utf-8', errors='ignore'), text)
+    return text
+
+
+@lru_cache(maxsize=8192)
+def _clean_text(text: str) -> str:
+    if not text:
+        return ""
+    # Texte ASCII : rien a reparer ni a normaliser
+    if text.isascii():
+        return text.strip()
+    text = _fix_encoding(text)
+    text = unicodedata.normalize('NFC', text)
+    text = _NON_LATIN_RE.sub(' ', text)
+    return text.strip()
+
+
+def _score_summary(scored: list[dict]) -> tuple[int, int, int, float]:
+    """Retourne (nb >= 70, nb 40-69, nb < 40, moyenne arrondie) des scores."""
+    if not scored:
+        return 0, 0, 0, 0.0
+    # Un seul passage sur les scores (somme dans le meme ordre que sum())
+    high = medium = low = 0
+    total_score = 0.0
+    for s in scored:
+        sc = s["score"]
+        total_score += sc
+        if sc >= 70:
+            high += 1
+        elif sc >= 40:
+            medium += 1
+        else:
+            low += 1
+    return high, medium, low, round(total_score / len(scored), 1)
+
+
+_PDF_THEME: tuple[dict, dict] | None = None
+
+
+def _get_pdf_theme() -> tuple[dict, dict]:
+    """
+    Palette et styles de paragraphe du rapport PDF, construits une seule fois
+    par processus puis partages entre tous les documents.
+    Leve ImportError si reportlab n'est pas installe.
+    """
+    global _PDF_THEME
+    if _PDF_THEME is None:
+        from reportlab.lib.colors import HexColor, white
+        from reportlab.lib.styles import ParagraphStyle
+        from reportlab.lib.enums import TA_CENTER
+
+        C = {
+            "NAVY":       HexColor("#0B1D3A"),
+            "DARK_NAVY":  HexColor("#06132A"),
+            "GOLD":       HexColor("#C9A84C"),
+            "BLUE_ACC":   HexColor("#2E86DE"),
+            "GREEN":      HexColor("#27AE60"),
+            "ORANGE":     HexColor("#F39C12"),
+            "RED":        HexColor("#E74C3C"),
+            "DARK_GRAY":  HexColor("#2C3E50"),
+            "MID_GRAY":   HexColor("#636E72"),
+            "LIGHT_GRAY": HexColor("#DFE6E9"),
+            "CARD_BG":    HexColor("#F8F9FA"),
+            "WHITE_CLR":  white,
+            "COVER_SUB":  HexColor("#7A8FA6"),
+            "COVER_TXT":  HexColor("#AAB5C0"),
+            "COVER_FOOT": HexColor("#556677"),
+            "UPSELL_BG":  HexColor("#FFF8E1"),
+        }
+        S = {
+            'section_label': ParagraphStyle('NX_SL', fontName='Helvetica-Bold', fontSize=8, textColor=C["GOLD"], spaceBefore=0, spaceAfter=2, leading=10),
+            'section_title': ParagraphStyle('NX_ST', fontName='Helvetica-Bold', fontSize=14, textColor=C["NAVY"], spaceBefore=4, spaceAfter=6, leading=17),
+            'body': ParagraphStyle('NX_Body', fontName='Helvetica', fontSize=9, textColor=C["DARK_GRAY"], spaceAfter=4, leading=13),
+            'small': ParagraphStyle('NX_Small', fontName='Helvetica', fontSize=7, textColor=C["MID_GRAY"], spaceAfter=2, leading=9),
+            'kpi_value': ParagraphStyle('K1', alignment=TA_CENTER, textColor=C["NAVY"]),
+            'kpi_value_colored': ParagraphStyle('K2', alignment=TA_CENTER),
+            'kpi_label': ParagraphStyle('KL1', fontSize=7, textColor=C["MID_GRAY"], alignment=TA_CENTER),
+            'best_title': ParagraphStyle('BT', fontName='Helvetica-Bold', fontSize=10, textColor=C["NAVY"], spaceAfter=10, leading=14),
+            'centered': ParagraphStyle('SV', alignment=TA_CENTER),
+            'breakdown_title': ParagraphStyle('DI', fontName='Helvetica-Bold', fontSize=9, textColor=C["NAVY"], spaceAfter=8),
+            'summary': ParagraphStyle('SumC', fontName='Helvetica', fontSize=8.5, textColor=C["DARK_GRAY"], leading=13),
+            'reco': ParagraphStyle('RT', fontName='Helvetica', fontSize=8.5, textColor=C["DARK_GRAY"], leading=13),
+            'upsell': ParagraphStyle('Upsell', leading=13),
+        }
+        _PDF_THEME = (C, S)
+    return _PDF_THEME
+
+
+@lru_cache(maxsize=1)
+def _score_bar_class():
+    """Flowable de barre de progression (classe creee a la demande, reportlab etant optionnel)."""
+    from reportlab.platypus import Flowable
+
+    class ScoreBar(Flowable):
+        """Barre libelle + valeur en %, dessinee directement sur le canvas."""
+
+        def __init__(self, label: str, value: float, color, label_color, track_color):
+            super().__init__()
+            self.label = label
+            self.value = value
+            self.color = color
+            self.label_color = label_color
+            self.track_color = track_color
+
+        def wrap(self, availWidth, availHeight):
+            return 420, 24
+
+        def draw(self):
+            c = self.canv
+            c.setFont("Helvetica-Bold", 7.5)
+            c.setFillColor(self.label_color)
+            c.drawString(0, 15, self.label)
+            c.setFillColor(self.color)
+            c.drawString(390, 15, f"{self.value:.0f}%")
+            # Fond
+            c.setFillColor(self.track_color)
+            c.roundRect(0, 2, 380, 8, 4, stroke=0, fill=1)
+            # Barre remplie
+            c.setFillColor(self.color)
+            c.roundRect(0, 2, int(max(6.0, 380.0 * self.value / 100)), 8, 4, stroke=0, fill=1)
+
+    return ScoreBar
+
+
+def _render_pdf_worker(
+    enterprise_id: int,
+    recommendations: list[str] | None,
+    subscription_plan: str,
+    scored: list[dict],
+) -> tuple[int, str | None]:
+    """
+    Genere le PDF d'une entreprise dans un processus fils, avec sa propre session.
+    Les scores sont deja calcules : le worker ne fait que lire et rendre, aucune
+    ecriture sur les analyses.
+    """
+    from app.database import SessionLocal
+    db = SessionLocal()
+    try:
+        service = ReportGeneratorService(db)
+        return enterprise_id, service._render_pdf_report(enterprise_id, recommendations, subscription_plan, scored)
+    except Exception as e:
+        logger.error(f"Erreur PDF entreprise {enterprise_id}: {e}")
+        return enterprise_id, None
+    finally:
+        db.close()
+
+
+# ── Jobs PDF en arriere-plan ──
+# La route HTTP ne fait qu'enfiler le job ; le rendu tourne hors du thread de requete.
+# Le registre est en memoire : un job n'est connu que du processus qui l'a cree,
+# et il est oublie PDF_JOB_TTL secondes apres la fin du rendu.
+PDF_JOB_TTL = 3600
+_PDF_JOB_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="pdf-job")
+_PDF_JOBS: dict[str, Future] = {}
+_PDF_JOBS_DONE_AT: dict[str, float] = {}
+_PDF_JOBS_LOCK = threading.Lock()
+
+
+def _mark_pdf_job_done(job_id: str) -> None:
+    with _PDF_JOBS_LOCK:
+        _PDF_JOBS_DONE_AT[job_id] = time.monotonic()
+
+
+def _purge_expired_pdf_jobs() -> None:
+    """Retire du registre les jobs termines depuis plus de PDF_JOB_TTL secondes."""
+    cutoff = time.monotonic() - PDF_JOB_TTL
+    with _PDF_JOBS_LOCK:
+        expired = [job_id for job_id, done_at in _PDF_JOBS_DONE_AT.items() if done_at < cutoff]
+        for job_id in expired:
+            del _PDF_JOBS_DONE_AT[job_id]
+            _PDF_JOBS.pop(job_id, None)
+    if expired:
+        logger.info(f"{len(expired)} job(s) PDF expire(s) retire(s) du registre")
+
+
+def _run_pdf_job(enterprise_id: int, recommendations: list[str] | None, subscription_plan: str) -> str | None:
+    """
+    Job d'arriere-plan : un seul scoring, partage entre les recommandations IA
+    (si absentes) et le rendu du PDF.
+    """
+    from app.database import SessionLocal
+    from app.services.ai_analyzer import AIAnalyzerService
+    db = SessionLocal()
+    try:
+        enterprise = db.query(Enterprise).get(enterprise_id)
+        if not enterprise:
+            return None
+        service = ReportGeneratorService(db)
+        scored = service.scorer.score_all_for_enterprise(enterprise)
+        if recommendations is None:
+            try:
+                recommendations = AIAnalyzerService(db).generate_budget_recommendations(
+                    enterprise, scored[:5], subscription_plan
+                )
+            except Exception as e:
+                logger.error(f"Erreur recommandations PDF: {e}")
+        return service.generate_pdf_report(enterprise_id, recommendations, subscription_plan, scored=scored)
+    except Exception as e:
+        logger.error(f"Erreur PDF entreprise {enterprise_id}: {e}")
+        return None
+    finally:
+        db.close()
+
+
+def enqueue_pdf_report(
+    enterprise_id: int,
+    recommendations: list[str] | None = None,
+    subscription_plan: str = "ENTRY",
+) -> str:
+    """Planifie la generation du PDF et retourne l'identifiant du job."""
+    _purge_expired_pdf_jobs()
+    job_id = uuid.uuid4().hex
+    future = _PDF_JOB_EXECUTOR.submit(_run_pdf_job, enterprise_id, recommendations, subscription_plan)
+    with _PDF_JOBS_LOCK:
+        _PDF_JOBS[job_id] = future
+    future.add_done_callback(lambda _f: _mark_pdf_job_done(job_id))
+    logger.info(f"Job PDF {job_id} planifie pour l'entreprise {enterprise_id}")
+    return job_id
+
+
+def get_pdf_job(job_id: str) -> tuple[str, str | None] | None:
+    """
+    Etat d'un job PDF : (statut, chemin du fichier).
+    Statuts : pending, running, done, failed. None si le job est inconnu
+    (jamais cree dans ce processus, ou expire).
+    """
+    _purge_expired_pdf_jobs()
+    with _PDF_JOBS_LOCK:
+        future = _PDF_JOBS.get(job_id)
+    if future is None:
+        return None
+    if not future.done():
+        return ("running" if future.running() else "pending"), None
+    if future.exception() is not None:
+        return "failed", None
+    filepath = future.result()
+    return ("done" if filepath else "failed"), filepath
+
 
 class ReportGeneratorService:
     """Generation de rapports PDF premium NOBILIS X"""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, scorer: ScorerService | None = None):
+        """`scorer` : ScorerService deja prepare (ex: tenders precharges) a reutiliser."""
         self.db = db
-        self.scorer = ScorerService(db)
-
-    def _fix_encoding(self, text: str) -> str:
-        if not text:
-            return ""
-        try:
-            fixed = text.encode('latin-1').decode('utf-8')
-            if fixed != text: return fixed
-        except (UnicodeDecodeError, UnicodeEncodeError):
-            pass
-        replacements = {
-            'Ã©': 'é', 'Ã¨': 'è', 'Ãª': 'ê', 'Ã«': 'ë', 'Ã ': 'à', 'Ã¢': 'â', 'Ã§': 'ç', 'Ã´': 'ô',
-            'Ã¹': 'ù', 'Ã»': 'û', 'Ã®': 'î', 'Ã¯': 'ï', 'Ã\x89': 'É', 'Ã\x80': 'À', 'Ã\x94': 'Ô',
-            'â\x80\x99': "'", 'â\x80\x93': '-', 'â\x80\x94': '-', 'â\x80\xa6': '...',
-            'd\u00e2\u0080\u0099': "d'", 'l\u00e2\u0080\u0099': "l'",
-            'd\u00e2': "d'", 'l\u00e2': "l'", 'n\u00e2': "n'",
-        }
-        for bad, good in replacements.items():
-            text = text.replace(bad, good)
-        text = re.sub(r'Ã([\u00a0-\u00bf])', lambda m: (chr(ord(m.group(1)) + 64)).encode('latin-1').decode('utf-8', errors='ignore'), text)
-        return text
-
-    def _clean_text(self, text: str) -> str:
-        if not text:
-            return ""
-        text = self._fix_encoding(text)
-        text = unicodedata.normalize('NFC', text)
-        text = re.sub(r'[^\x00-\x7F\xc0-\xff]+', ' ', text)
-        return text.strip()
+        self.scorer = scorer if scorer is not None else ScorerService(db)
 
     def _fmt_gnf(self, amount) -> str:
         """Formate un montant en GNF."""
@@ -59,38 +303,74 @@ class ReportGeneratorService:
             return "Non specifie"
         return f"{amount:,.0f} GNF".replace(",", " ")
 
+    def _load_tenders_and_analyses(self, tender_ids: list[int]) -> tuple[dict, dict]:
+        """Charge en 2 requetes (IN) les tenders et analyses, indexes par tender_id."""
+        if not tender_ids:
+            return {}, {}
+        tenders = {t.id: t for t in self.db.query(Tender).filter(Tender.id.in_(tender_ids)).all()}
+        analyses = {a.tender_id: a for a in self.db.query(Analysis).filter(Analysis.tender_id.in_(tender_ids)).all()}
+        return tenders, analyses
+
     def generate_enterprise_report(self, enterprise_id: int) -> dict:
         enterprise = self.db.query(Enterprise).get(enterprise_id)
         if not enterprise:
             return {"error": "Entreprise non trouvee"}
         scored_analyses = self.scorer.score_all_for_enterprise(enterprise)
+        high, medium, low, avg = _score_summary(scored_analyses)
         report: dict = {
             "generated_at": datetime.utcnow().isoformat(),
             "enterprise": {"id": enterprise.id, "name": enterprise.name, "sector": enterprise.sector, "budget_range": f"{self._fmt_gnf(enterprise.min_budget)} - {self._fmt_gnf(enterprise.max_budget)}", "zones": enterprise.zones, "experience_years": enterprise.experience_years},
-            "summary": {"total_tenders_analyzed": len(scored_analyses), "high_match": len([s for s in scored_analyses if s["score"] >= 70]), "medium_match": len([s for s in scored_analyses if 40 <= s["score"] < 70]), "low_match": len([s for s in scored_analyses if s["score"] < 40]), "average_score": round(float(sum(s["score"] for s in scored_analyses)) / len(scored_analyses), 1) if scored_analyses else 0.0},
+            "summary": {"total_tenders_analyzed": len(scored_analyses), "high_match": high, "medium_match": medium, "low_match": low, "average_score": avg},
             "top_opportunities": [],
         }
-        for item in scored_analyses[:20]:
-            analysis = self.db.query(Analysis).filter(Analysis.tender_id == item["tender_id"]).first()
-            tender = self.db.query(Tender).get(item["tender_id"])
+        top_items = scored_analyses[:20]
+        tenders, analyses = self._load_tenders_and_analyses([item["tender_id"] for item in top_items])
+        for item in top_items:
+            analysis = analyses.get(item["tender_id"])
+            tender = tenders.get(item["tender_id"])
             report["top_opportunities"].append({"tender_id": item["tender_id"], "title": item["tender_title"], "score": item["score"], "score_details": item["details"], "summary": analysis.summary if analysis else None, "sector": tender.sector if tender else None, "budget": tender.estimated_budget if tender else None, "location": tender.location if tender else None, "deadline": tender.deadline.isoformat() if tender and tender.deadline else None, "source_url": tender.source_url if tender else None})
         return report
 
-    def generate_pdf_report(self, enterprise_id: int, recommendations: list[str] | None = None, subscription_plan: str = "ENTRY") -> str | None:
-        """Genere un rapport PDF premium. Le contenu varie selon le plan."""
+    def generate_pdf_report(
+        self,
+        enterprise_id: int,
+        recommendations: list[str] | None = None,
+        subscription_plan: str = "ENTRY",
+        scored: list[dict] | None = None,
+    ) -> str | None:
+        """
+        Genere un rapport PDF premium. Le contenu varie selon le plan.
+        Lot d'une seule entreprise (generate_pdf_reports_batch), rendu dans ce processus.
+        `scored` : resultats de score_all_for_enterprise deja calcules (sinon recalcules ici) ;
+        la liste de l'appelant n'est pas modifiee.
+        """
+        return self.generate_pdf_reports_batch(
+            [enterprise_id],
+            recommendations={enterprise_id: recommendations},
+            subscription_plans={enterprise_id: subscription_plan},
+            scored={enterprise_id: scored},
+        )[enterprise_id]
+
+    def _render_pdf_report(
+        self,
+        enterprise_id: int,
+        recommendations: list[str] | None,
+        subscription_plan: str,
+        scored: list[dict],
+    ) -> str | None:
+        """Rendu du PDF d'une entreprise a partir de ses scores deja calcules."""
         plan = (subscription_plan or "ENTRY").upper()
         is_elite = plan == "ELITE"
         try:
             from reportlab.lib.pagesizes import A4
             from reportlab.lib.units import cm, mm
-            from reportlab.lib.colors import HexColor, white
-            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-            from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
+            from reportlab.lib.colors import HexColor
             from reportlab.platypus import (
                 BaseDocTemplate, SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle,
                 HRFlowable, PageBreak, NextPageTemplate, PageTemplate, Frame
             )
-            from reportlab.graphics.shapes import Drawing, Rect, String
+            C, S = _get_pdf_theme()
+            ScoreBar = _score_bar_class()
         except ImportError:
             logger.error("reportlab non installe")
             return None
@@ -99,13 +379,14 @@ class ReportGeneratorService:
         if not enterprise:
             return None
 
-        scored = self.scorer.score_all_for_enterprise(enterprise)
+        scored = [dict(item) for item in scored]  # Enrichi ci-dessous pour le rendu
+        tenders, analyses = self._load_tenders_and_analyses([item["tender_id"] for item in scored])
         for item in scored:
-            item["tender_title"] = self._clean_text(item["tender_title"])
-            analysis = self.db.query(Analysis).filter(Analysis.tender_id == item["tender_id"]).first()
+            item["tender_title"] = _clean_text(item["tender_title"])
+            analysis = analyses.get(item["tender_id"])
             if analysis:
-                item["summary"] = self._clean_text(analysis.summary or "")
-            tender = self.db.query(Tender).get(item["tender_id"])
+                item["summary"] = _clean_text(analysis.summary or "")
+            tender = tenders.get(item["tender_id"])
             if tender:
                 item["deadline"] = tender.deadline.strftime("%d/%m/%Y") if tender.deadline else "N/A"
                 item["budget_display"] = self._fmt_gnf(tender.estimated_budget)
@@ -122,23 +403,22 @@ class ReportGeneratorService:
         filepath = os.path.join(REPORTS_DIR, filename)
 
         # ── PALETTE ──
-        NAVY       = HexColor("#0B1D3A")
-        DARK_NAVY  = HexColor("#06132A")
-        GOLD       = HexColor("#C9A84C")
-        BLUE_ACC   = HexColor("#2E86DE")
-        GREEN      = HexColor("#27AE60")
-        ORANGE     = HexColor("#F39C12")
-        RED        = HexColor("#E74C3C")
-        DARK_GRAY  = HexColor("#2C3E50")
-        MID_GRAY   = HexColor("#636E72")
-        LIGHT_GRAY = HexColor("#DFE6E9")
-        CARD_BG    = HexColor("#F8F9FA")
-        WHITE_CLR  = white
+        NAVY       = C["NAVY"]
+        DARK_NAVY  = C["DARK_NAVY"]
+        GOLD       = C["GOLD"]
+        GREEN      = C["GREEN"]
+        ORANGE     = C["ORANGE"]
+        RED        = C["RED"]
+        DARK_GRAY  = C["DARK_GRAY"]
+        MID_GRAY   = C["MID_GRAY"]
+        LIGHT_GRAY = C["LIGHT_GRAY"]
+        CARD_BG    = C["CARD_BG"]
+        WHITE_CLR  = C["WHITE_CLR"]
 
         W, H = A4
         date_str = datetime.utcnow().strftime("%d/%m/%Y")
-        ent_name = self._clean_text(enterprise.name)
-        ent_sector = self._clean_text(enterprise.sector)
+        ent_name = _clean_text(enterprise.name)
+        ent_sector = _clean_text(enterprise.sector)
 
         # ── CALLBACKS ──
         def draw_cover(canvas, doc):
@@ -157,7 +437,7 @@ class ReportGeneratorService:
             canvas.setFillColor(GOLD)
             canvas.setFont("Helvetica-Bold", 38)
             canvas.drawCentredString(W/2, H - 85*mm, "NOBILIS X")
-            canvas.setFillColor(HexColor("#7A8FA6"))
+            canvas.setFillColor(C["COVER_SUB"])
             canvas.setFont("Helvetica", 8)
             canvas.drawCentredString(W/2, H - 94*mm, "SYSTEME EXPERT DE VEILLE & ANALYSE DES MARCHES PUBLICS")
 
@@ -171,14 +451,14 @@ class ReportGeneratorService:
             canvas.setFont("Helvetica-Bold", 17)
             canvas.drawCentredString(W/2, H - 130*mm, "Rapport d'Intelligence des Marches")
             canvas.setFont("Helvetica", 11)
-            canvas.setFillColor(HexColor("#AAB5C0"))
+            canvas.setFillColor(C["COVER_TXT"])
             canvas.drawCentredString(W/2, H - 142*mm, "Analyse Strategique Personnalisee")
 
             # Nom entreprise
             canvas.setFillColor(GOLD)
             canvas.setFont("Helvetica-Bold", 24)
             canvas.drawCentredString(W/2, H - 175*mm, ent_name)
-            canvas.setFillColor(HexColor("#7A8FA6"))
+            canvas.setFillColor(C["COVER_SUB"])
             canvas.setFont("Helvetica", 10)
             canvas.drawCentredString(W/2, H - 188*mm, f"Secteur : {ent_sector}")
 
@@ -191,7 +471,7 @@ class ReportGeneratorService:
             canvas.setFillColor(GOLD)
             canvas.setFont("Helvetica", 7.5)
             canvas.drawCentredString(W/2, 52*mm, "Fait en Guinee. Concu pour que les meilleurs gagnent.")
-            canvas.setFillColor(HexColor("#556677"))
+            canvas.setFillColor(C["COVER_FOOT"])
             canvas.setFont("Helvetica", 6.5)
             canvas.drawCentredString(W/2, 44*mm, f"Document confidentiel - Destine exclusivement a {ent_name}")
             canvas.restoreState()
@@ -241,17 +521,10 @@ class ReportGeneratorService:
         content_frame = Frame(18*mm, 22*mm, W - 36*mm, H - 50*mm, id='content')
         content_template = PageTemplate(id='content', frames=[content_frame], onPage=draw_header_footer)
 
-        doc = BaseDocTemplate(filepath, pagesize=A4)
+        buf = io.BytesIO()
+        doc = BaseDocTemplate(buf, pagesize=A4)
         doc.addPageTemplates([cover_template, content_template])
 
-        # ── STYLES ──
-        styles = getSampleStyleSheet()
-        S = {}
-        S['section_label'] = ParagraphStyle('NX_SL', fontName='Helvetica-Bold', fontSize=8, textColor=GOLD, spaceBefore=0, spaceAfter=2, leading=10)
-        S['section_title'] = ParagraphStyle('NX_ST', fontName='Helvetica-Bold', fontSize=14, textColor=NAVY, spaceBefore=4, spaceAfter=6, leading=17)
-        S['body'] = ParagraphStyle('NX_Body', fontName='Helvetica', fontSize=9, textColor=DARK_GRAY, spaceAfter=4, leading=13)
-        S['small'] = ParagraphStyle('NX_Small', fontName='Helvetica', fontSize=7, textColor=MID_GRAY, spaceAfter=2, leading=9)
-
         # ── ELEMENTS ──
         elements = []
 
@@ -264,10 +537,7 @@ class ReportGeneratorService:
         # PAGE 2+ : SOMMAIRE EXECUTIF
         # ══════════════════════════════════════════════════════════════
         total = len(scored)
-        high = len([s for s in scored if s["score"] >= 70])
-        medium = len([s for s in scored if 40 <= s["score"] < 70])
-        low = len([s for s in scored if s["score"] < 40])
-        avg = round(float(sum(s["score"] for s in scored)) / total, 1) if total else 0.0
+        high, medium, low, avg = _score_summary(scored)
 
         elements.append(Paragraph("SOMMAIRE EXECUTIF", S['section_label']))
         elements.append(Paragraph("Vue d'ensemble de l'analyse", S['section_title']))
@@ -276,16 +546,16 @@ class ReportGeneratorService:
         # KPI — 4 cartes métriques
         avg_color = "#27AE60" if avg >= 70 else "#F39C12" if avg >= 40 else "#E74C3C"
         kpi_row1 = [
-            Paragraph(f'<font size="20"><b>{total}</b></font>', ParagraphStyle('K1', alignment=TA_CENTER, textColor=NAVY)),
-            Paragraph(f'<font size="20" color="#27AE60"><b>{high}</b></font>', ParagraphStyle('K2', alignment=TA_CENTER)),
-            Paragraph(f'<font size="20" color="#F39C12"><b>{medium}</b></font>', ParagraphStyle('K3', alignment=TA_CENTER)),
-            Paragraph(f'<font size="20" color="{avg_color}"><b>{avg}%</b></font>', ParagraphStyle('K4', alignment=TA_CENTER)),
+            Paragraph(f'<font size="20"><b>{total}</b></font>', S['kpi_value']),
+            Paragraph(f'<font size="20" color="#27AE60"><b>{high}</b></font>', S['kpi_value_colored']),
+            Paragraph(f'<font size="20" color="#F39C12"><b>{medium}</b></font>', S['kpi_value_colored']),
+            Paragraph(f'<font size="20" color="{avg_color}"><b>{avg}%</b></font>', S['kpi_value_colored']),
         ]
         kpi_row2 = [
-            Paragraph("Appels analyses", ParagraphStyle('KL1', fontSize=7, textColor=MID_GRAY, alignment=TA_CENTER)),
-            Paragraph("Indice >= 70", ParagraphStyle('KL2', fontSize=7, textColor=MID_GRAY, alignment=TA_CENTER)),
-            Paragraph("Indice 40-69", ParagraphStyle('KL3', fontSize=7, textColor=MID_GRAY, alignment=TA_CENTER)),
-            Paragraph("Indice moyen", ParagraphStyle('KL4', fontSize=7, textColor=MID_GRAY, alignment=TA_CENTER)),
+            Paragraph("Appels analyses", S['kpi_label']),
+            Paragraph("Indice >= 70", S['kpi_label']),
+            Paragraph("Indice 40-69", S['kpi_label']),
+            Paragraph("Indice moyen", S['kpi_label']),
         ]
         kpi = Table([kpi_row1, kpi_row2], colWidths=[3.8*cm]*4)
         kpi.setStyle(TableStyle([
@@ -310,12 +580,12 @@ class ReportGeneratorService:
 
         budget_str = f"{self._fmt_gnf(enterprise.min_budget)} - {self._fmt_gnf(enterprise.max_budget)}"
         pdata = [
-            ["NOM", self._clean_text(enterprise.name)],
-            ["SECTEUR", self._clean_text(enterprise.sector)],
+            ["NOM", _clean_text(enterprise.name)],
+            ["SECTEUR", _clean_text(enterprise.sector)],
             ["BUDGET", budget_str],
-            ["ZONES", self._clean_text(enterprise.zones or "Non precisees")],
+            ["ZONES", _clean_text(enterprise.zones or "Non precisees")],
             ["EXPERIENCE", f"{enterprise.experience_years} ans"],
-            ["CAPACITES", self._clean_text((enterprise.technical_capacity or "Non precisees")[:200])],
+            ["CAPACITES", _clean_text((enterprise.technical_capacity or "Non precisees")[:200])],
         ]
         pt = Table(pdata, colWidths=[3.2*cm, 12.5*cm])
         pt.setStyle(TableStyle([
@@ -379,7 +649,7 @@ class ReportGeneratorService:
                     sc_color = ORANGE
                 else:
                     sc_color = RED
-                row_bg = HexColor("#F8F9FA") if i % 2 == 0 else WHITE_CLR
+                row_bg = CARD_BG if i % 2 == 0 else WHITE_CLR
                 ts.extend([
                     ('BACKGROUND', (0,i), (-1,i), row_bg),
                     ('TEXTCOLOR', (2,i), (2,i), sc_color),
@@ -408,16 +678,16 @@ class ReportGeneratorService:
             sc_hex = "#27AE60" if sc >= 70 else "#F39C12" if sc >= 40 else "#E74C3C"
 
             # Titre
-            clean_title = self._clean_text(best["tender_title"])
+            clean_title = _clean_text(best["tender_title"])
             elements.append(Paragraph(
                 f'<b>"{clean_title[:200]}"</b>',
-                ParagraphStyle('BT', fontName='Helvetica-Bold', fontSize=10, textColor=NAVY, spaceAfter=10, leading=14)
+                S['best_title']
             ))
 
             # Score badge
             score_data = [
-                [Paragraph(f'<font size="26" color="{sc_hex}"><b>{sc:.0f}</b></font>', ParagraphStyle('SV', alignment=TA_CENTER))],
-                [Paragraph('<font size="7" color="#636E72">INDICE DE CREDIBILITE / 100</font>', ParagraphStyle('SL', alignment=TA_CENTER))],
+                [Paragraph(f'<font size="26" color="{sc_hex}"><b>{sc:.0f}</b></font>', S['centered'])],
+                [Paragraph('<font size="7" color="#636E72">INDICE DE CREDIBILITE / 100</font>', S['centered'])],
             ]
             score_tbl = Table(score_data, colWidths=[5*cm])
             score_tbl.setStyle(TableStyle([
@@ -432,7 +702,7 @@ class ReportGeneratorService:
             elements.append(Spacer(1, 5*mm))
 
             # Barres de progression
-            elements.append(Paragraph("Decomposition de l'Indice", ParagraphStyle('DI', fontName='Helvetica-Bold', fontSize=9, textColor=NAVY, spaceAfter=8)))
+            elements.append(Paragraph("Decomposition de l'Indice", S['breakdown_title']))
 
             criteria = [
                 ("Secteur (35%)", details.get("sector", 0)),
@@ -442,15 +712,7 @@ class ReportGeneratorService:
             ]
             for label, value in criteria:
                 val_hex = "#27AE60" if value >= 70 else "#F39C12" if value >= 40 else "#E74C3C"
-                d = Drawing(420, 24)
-                d.add(String(0, 15, label, fontName="Helvetica-Bold", fontSize=7.5, fillColor=DARK_GRAY))
-                d.add(String(390, 15, f"{value:.0f}%", fontName="Helvetica-Bold", fontSize=7.5, fillColor=HexColor(val_hex)))
-                # Fond
-                d.add(Rect(0, 2, 380, 8, fillColor=LIGHT_GRAY, strokeColor=None, rx=4, ry=4))
-                # Barre remplie
-                bar_w = int(max(6.0, 380.0 * value / 100))
-                d.add(Rect(0, 2, bar_w, 8, fillColor=HexColor(val_hex), strokeColor=None, rx=4, ry=4))
-                elements.append(d)
+                elements.append(ScoreBar(label, value, HexColor(val_hex), DARK_GRAY, LIGHT_GRAY))
 
             # Resume
             summary = best.get("summary", "")
@@ -458,7 +720,7 @@ class ReportGeneratorService:
                 elements.append(Spacer(1, 5*mm))
                 elements.append(Paragraph("RESUME STRATEGIQUE", S['section_label']))
                 sum_tbl = Table(
-                    [[Paragraph(summary[:1500], ParagraphStyle('SumC', fontName='Helvetica', fontSize=8.5, textColor=DARK_GRAY, leading=13))]],
+                    [[Paragraph(summary[:1500], S['summary'])]],
                     colWidths=[15.5*cm]
                 )
                 sum_tbl.setStyle(TableStyle([
@@ -481,11 +743,11 @@ class ReportGeneratorService:
             elements.append(HRFlowable(width="100%", thickness=1.5, color=GOLD, spaceAfter=10))
 
             for i, reco in enumerate(recommendations, 1):
-                clean_reco = self._clean_text(reco)
+                clean_reco = _clean_text(reco)
                 reco_tbl = Table(
                     [[
-                        Paragraph(f'<font color="#C9A84C" size="12"><b>{i}</b></font>', ParagraphStyle('RN', alignment=TA_CENTER)),
-                        Paragraph(clean_reco, ParagraphStyle(f'RT{i}', fontName='Helvetica', fontSize=8.5, textColor=DARK_GRAY, leading=13)),
+                        Paragraph(f'<font color="#C9A84C" size="12"><b>{i}</b></font>', S['centered']),
+                        Paragraph(clean_reco, S['reco']),
                     ]],
                     colWidths=[1.2*cm, 14.5*cm]
                 )
@@ -512,12 +774,12 @@ class ReportGeneratorService:
                     'l\'alerte temps reel et la couverture des 20 secteurs. '
                     'Contactez-nous : +224 627 27 13 97 ou trillionnx@gmail.com'
                     '</font>',
-                    ParagraphStyle('Upsell', leading=13)
+                    S['upsell']
                 )
             ]]
             upsell_tbl = Table(upsell_data, colWidths=[15.7*cm])
             upsell_tbl.setStyle(TableStyle([
-                ('BACKGROUND', (0,0), (-1,-1), HexColor("#FFF8E1")),
+                ('BACKGROUND', (0,0), (-1,-1), C["UPSELL_BG"]),
                 ('BOX', (0,0), (-1,-1), 1, GOLD),
                 ('TOPPADDING', (0,0), (-1,-1), 14),
                 ('BOTTOMPADDING', (0,0), (-1,-1), 14),
@@ -538,7 +800,72 @@ class ReportGeneratorService:
             S['small']
         ))
 
-        # BUILD
+        # BUILD : rendu en memoire puis une seule ecriture sur disque
         doc.build(elements)
+        with open(filepath, "wb") as f:
+            f.write(buf.getvalue())
         logger.info(f"PDF premium genere: {filepath}")
-        return filepath
\ No newline at end of file
+        return filepath
+
+    def generate_pdf_reports_batch(
+        self,
+        enterprise_ids: list[int],
+        recommendations: dict[int, list[str] | None] | None = None,
+        subscription_plans: dict[int, str] | None = None,
+        scored: dict[int, list[dict] | None] | None = None,
+    ) -> dict[int, str | None]:
+        """
+        Genere les PDF de plusieurs entreprises en parallele (un processus par coeur,
+        au plus un par entreprise). Avec un seul worker (une entreprise, ou une
+        machine mono-coeur), le rendu se fait dans ce processus.
+        Les scores absents de `scored` sont calcules ici, sequentiellement, dans le
+        processus parent : score_all_for_enterprise met a jour les memes lignes
+        `analyses` pour chaque entreprise, et des workers concurrents se disputeraient
+        leurs verrous. Les processus fils (reportlab, lie au CPU) ne font que lire et
+        rendre, chacun avec sa propre session DB. Ils sont demarres en `spawn` :
+        rien n'est herite du parent (connexions du pool, threads des jobs PDF).
+        Retourne {enterprise_id: chemin du PDF ou None}.
+        """
+        recommendations = recommendations or {}
+        subscription_plans = subscription_plans or {}
+        scored = dict(scored or {})
+        results: dict[int, str | None] = {enterprise_id: None for enterprise_id in enterprise_ids}
+        if not enterprise_ids:
+            return results
+
+        enterprises = self.db.query(Enterprise).filter(Enterprise.id.in_(enterprise_ids)).all()
+        to_score = [enterprise for enterprise in enterprises if scored.get(enterprise.id) is None]
+        if len(to_score) > 1:
+            self.scorer.preload_tenders()
+        for enterprise in to_score:
+            scored[enterprise.id] = self.scorer.score_all_for_enterprise(enterprise)
+
+        jobs = [
+            (
+                enterprise.id,
+                recommendations.get(enterprise.id),
+                subscription_plans.get(enterprise.id, "ENTRY"),
+                scored[enterprise.id],
+            )
+            for enterprise in enterprises
+        ]
+        workers = min(len(jobs), os.cpu_count() or 1)
+
+        if workers <= 1:
+            for job in jobs:
+                try:
+                    results[job[0]] = self._render_pdf_report(*job)
+                except Exception as e:
+                    logger.error(f"Erreur PDF entreprise {job[0]}: {e}")
+            return results
+
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            futures = [executor.submit(_render_pdf_worker, *job) for job in jobs]
+            for future in futures:
+                enterprise_id, filepath = future.result()
+                results[enterprise_id] = filepath
+
+        logger.info(f"{sum(1 for p in results.values() if p)}/{len(enterprise_ids)} PDF generes en parallele")
+        return results
@@ -6,17 +6,48 @@ Critères : secteur, budget, zone géographique, expérience.
 """
 
 import logging
+import heapq
+import re
+from dataclasses import dataclass
 from difflib import SequenceMatcher
+from functools import lru_cache
 
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app.models.enterprise import Enterprise
 from app.models.tender import Tender
 from app.models.analysis import Analysis
+from app.services.scorer_kernels import budget_score, budget_scores
+
+try:
+    import ahocorasick  # pyahocorasick (requirements.txt) : mots-clés en une seule passe
+except ImportError:  # Repli sur la recherche de sous-chaînes, mêmes résultats (tests/test_scorer.py)
+    ahocorasick = None
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class EnterpriseScoringCtx:
+    """
+    Données d'une entreprise pré-calculées une fois pour tout le scoring.
+    Évite de refaire lower/split/compréhensions à chaque tender.
+    """
+    id: int | None
+    name: str
+    sector: str | None                  # Secteur en minuscules (None si absent)
+    sector_bases: frozenset[str]        # Secteurs de base reconnus via les synonymes
+    min_budget: float
+    max_budget: float
+    zones: tuple[str, ...] | None       # Zones en minuscules (None si absentes)
+    zone_words: frozenset[str]          # Mots de toutes les zones
+    exclude_keywords: tuple[str, ...]
+    specific_keywords: tuple[str, ...]
+    experience_score: float
+    keyword_automaton: object | None = None  # Automate Aho-Corasick (si disponible)
+
+
 class ScorerService:
     """Calcul du score de correspondance tender/entreprise"""
 
@@ -52,18 +83,43 @@ class ScorerService:
         "travaux publics": ["construction", "btp", "génie civil", "bâtiment", "infrastructure", "route"],
     }
 
+    # Un motif compilé par secteur de base (base + synonymes)
+    _SECTOR_PATTERNS = [
+        (base, re.compile("|".join(re.escape(term) for term in [base] + synonyms)))
+        for base, synonyms in SECTOR_SYNONYMS.items()
+    ]
+
     def __init__(self, db: Session):
         self.db = db
+        self._preloaded_rows: list[dict] | None = None
+
+    @classmethod
+    @lru_cache(maxsize=2048)
+    def _sector_bases(cls, sector: str) -> frozenset[str]:
+        """
+        Secteurs de base dont un terme (ou synonyme) apparaît dans le texte.
+        Mis en cache : les libellés de secteurs se répètent d'un tender à l'autre.
+        """
+        return frozenset(base for base, pattern in cls._SECTOR_PATTERNS if pattern.search(sector))
 
-    def _sector_score(self, enterprise_sector: str, tender_sector: str) -> float:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _text_similarity(a: str, b: str) -> float:
+        """
+        Similarité 0-1 entre deux libellés (difflib).
+        Mise en cache : les couples secteur entreprise / secteur tender se répètent.
+        """
+        return SequenceMatcher(None, a, b).ratio()
+
+    def _sector_score(self, ctx: EnterpriseScoringCtx, tender_sector: str) -> float:
         """
         Calcule la correspondance sectorielle (0-1).
         Utilise la similarité textuelle + synonymes.
         """
-        if not enterprise_sector or not tender_sector:
+        if ctx.sector is None or not tender_sector:
             return 0.0
 
-        e_sector = enterprise_sector.lower().strip()
+        e_sector = ctx.sector
         t_sector = tender_sector.lower().strip()
 
         # Correspondance exacte
@@ -75,15 +131,12 @@ class ScorerService:
             return 0.9
 
         # Vérifier les synonymes
-        for base_sector, synonyms in self.SECTOR_SYNONYMS.items():
-            all_terms = [base_sector] + synonyms
-            e_match = any(term in e_sector for term in all_terms)
-            t_match = any(term in t_sector for term in all_terms)
-            if e_match and t_match:
-                return 0.85
+        e_bases = ctx.sector_bases
+        if e_bases and not e_bases.isdisjoint(self._sector_bases(t_sector)):
+            return 0.85
 
         # Similarité textuelle de fallback
-        similarity = SequenceMatcher(None, e_sector, t_sector).ratio()
+        similarity = self._text_similarity(e_sector, t_sector)
         return similarity if similarity > 0.5 else similarity * 0.3
 
     def _budget_score(
@@ -96,37 +149,16 @@ class ScorerService:
         Calcule l'adéquation budgétaire (0-1).
         Score maximal si le budget estimé est dans la fourchette.
         """
-        if not estimated_budget or estimated_budget <= 0:
-            return 0.5  # Score neutre si budget non disponible
-
-        if min_budget <= 0 and max_budget <= 0:
-            return 0.5  # Score neutre si pas de fourchette définie
-
-        # Dans la fourchette
-        if min_budget <= estimated_budget <= max_budget:
-            return 1.0
+        return budget_score(min_budget, max_budget, estimated_budget)
 
-        # Calcul de la proximité si hors fourchette
-        if max_budget > 0 and estimated_budget > max_budget:
-            # Budget trop élevé - pénalité progressive
-            ratio = max_budget / estimated_budget
-            return max(0.1, ratio)
-
-        if min_budget > 0 and estimated_budget < min_budget:
-            # Budget trop faible - pénalité progressive
-            ratio = estimated_budget / min_budget
-            return max(0.1, ratio)
-
-        return 0.5
-
-    def _location_score(self, enterprise_zones: str | None, tender_location: str | None) -> float:
+    def _location_score(self, ctx: EnterpriseScoringCtx, tender_location: str | None) -> float:
         """
         Calcule la correspondance géographique (0-1).
         """
-        if not enterprise_zones or not tender_location:
+        if not ctx.zones or not tender_location:
             return 0.5  # Score neutre si pas de données
 
-        zones = [z.strip().lower() for z in enterprise_zones.split(",")]
+        zones = ctx.zones
         location = tender_location.lower().strip()
 
         # Correspondance exacte avec une zone
@@ -135,12 +167,8 @@ class ScorerService:
                 return 1.0
 
         # Correspondance partielle (mots communs)
-        location_words = set(location.split())
-        for zone in zones:
-            zone_words = set(zone.split())
-            common = location_words & zone_words
-            if common:
-                return 0.7
+        if not ctx.zone_words.isdisjoint(location.split()):
+            return 0.7
 
         return 0.2
 
@@ -161,52 +189,137 @@ class ScorerService:
 
 
 
-    def _keyword_score(self, enterprise: Enterprise, tender_text: str) -> float:
+    def _keyword_score(self, ctx: EnterpriseScoringCtx, tender_text: str) -> float:
         """
         Calcule un ajustement de score basé sur les mots-clés spécifiques et à exclure.
         Retourne un multiplicateur ou un ajustement (0.0 à 2.0).
+        `tender_text` est attendu déjà en minuscules.
         """
-        text = tender_text.lower()
+        text = tender_text
         score_adj = 1.0
 
-        # Mots-clés à exclure (Malus fort / Exclusion)
-        if enterprise.exclude_keywords:
-            ex_keywords = [k.strip().lower() for k in enterprise.exclude_keywords.split(",") if k.strip()]
-            for kw in ex_keywords:
+        if ctx.keyword_automaton is not None:
+            # Un seul passage sur le texte pour tous les mots-clés
+            found = set()
+            for _, kw in ctx.keyword_automaton.iter(text):
+                if kw in ctx.exclude_keywords:
+                    logger.info(f"🚫 Exclusion trouvée ({kw}) pour {ctx.name}")
+                    return 0.0
+                found.add(kw)
+            matches = sum(1 for kw in ctx.specific_keywords if kw in found)
+        else:
+            # Mots-clés à exclure (Malus fort / Exclusion)
+            for kw in ctx.exclude_keywords:
                 if kw in text:
-                    logger.info(f"🚫 Exclusion trouvée ({kw}) pour {enterprise.name}")
+                    logger.info(f"🚫 Exclusion trouvée ({kw}) pour {ctx.name}")
                     return 0.0  # Score zéro si un mot exclu est présent
 
-        # Mots-clés spécifiques (Bonus)
-        if enterprise.specific_keywords:
-            sp_keywords = [k.strip().lower() for k in enterprise.specific_keywords.split(",") if k.strip()]
+            # Mots-clés spécifiques (Bonus)
             matches = 0
-            for kw in sp_keywords:
+            for kw in ctx.specific_keywords:
                 if kw in text:
                     matches += 1
-            
-            if matches > 0:
-                # Bonus de 10% par match, max 30%
-                bonus = min(0.3, matches * 0.1)
-                score_adj += bonus
-                logger.info(f"✨ Bonus mots-clés (+{bonus*100:.0f}%) pour {enterprise.name} ({matches} matchs)")
+
+        if matches > 0:
+            # Bonus de 10% par match, max 30%
+            bonus = min(0.3, matches * 0.1)
+            score_adj += bonus
+            logger.info(f"✨ Bonus mots-clés (+{bonus*100:.0f}%) pour {ctx.name} ({matches} matchs)")
 
         return score_adj
 
-    def calculate_score(self, enterprise: Enterprise, tender: Tender, analysis: Analysis | None = None) -> dict:
+    def build_context(self, enterprise: Enterprise) -> EnterpriseScoringCtx:
+        """
+        Pré-calcule une fois les données de l'entreprise utilisées par le scoring.
+        À réutiliser pour scorer plusieurs tenders de la même entreprise (calculate_score).
+        """
+        sector = enterprise.sector.lower().strip() if enterprise.sector else None
+        zones = (
+            tuple(z.strip().lower() for z in enterprise.zones.split(","))
+            if enterprise.zones else None
+        )
+        ex_keywords = tuple(
+            k.strip().lower() for k in (enterprise.exclude_keywords or "").split(",") if k.strip()
+        )
+        sp_keywords = tuple(
+            k.strip().lower() for k in (enterprise.specific_keywords or "").split(",") if k.strip()
+        )
+        automaton = None
+        if ahocorasick is not None and (ex_keywords or sp_keywords):
+            automaton = ahocorasick.Automaton()
+            for kw in ex_keywords + sp_keywords:
+                automaton.add_word(kw, kw)
+            automaton.make_automaton()
+
+        return EnterpriseScoringCtx(
+            id=enterprise.id,
+            name=enterprise.name,
+            sector=sector,
+            sector_bases=self._sector_bases(sector) if sector is not None else frozenset(),
+            min_budget=enterprise.min_budget,
+            max_budget=enterprise.max_budget,
+            zones=zones,
+            zone_words=frozenset(w for z in zones for w in z.split()) if zones else frozenset(),
+            exclude_keywords=ex_keywords,
+            specific_keywords=sp_keywords,
+            experience_score=self._experience_score(enterprise.experience_years, None),
+            keyword_automaton=automaton,
+        )
+
+    def calculate_score(
+        self,
+        enterprise: Enterprise,
+        tender: Tender,
+        analysis: Analysis | None = None,
+        ctx: EnterpriseScoringCtx | None = None,
+    ) -> dict:
         """
         Calcule le score global de correspondance (0-100).
+        `ctx` (voir build_context) évite de reconstruire le contexte de
+        l'entreprise, automate de mots-clés compris, à chaque tender.
         """
         tender_sector = tender.sector or (analysis.extracted_sector if analysis else None) or ""
         tender_budget = tender.estimated_budget or (analysis.extracted_budget if analysis else None)
         tender_location = tender.location or (analysis.extracted_location if analysis else None)
         tender_text = (tender.raw_text or tender.description or tender.title or "").lower()
+        if ctx is None:
+            ctx = self.build_context(enterprise)
+        return self._score_values(ctx, tender_sector, tender_budget, tender_location, tender_text)
+
+    def _score_values(
+        self,
+        ctx: EnterpriseScoringCtx,
+        tender_sector: str,
+        tender_budget: float | None,
+        tender_location: str | None,
+        tender_text: str,
+        budget_s: float | None = None,
+    ) -> dict:
+        """
+        Calcule le score à partir des valeurs déjà extraites du tender.
+        `budget_s` peut être fourni s'il a été calculé en lot (voir budget_scores).
+        """
+        # Ajustement par mots-clés : une exclusion rend les autres critères inutiles
+        kw_multiplier = self._keyword_score(ctx, tender_text)
+        if kw_multiplier == 0.0:
+            return {
+                "score": 0.0,
+                "details": {
+                    "sector": 0.0,
+                    "budget": 0.0,
+                    "location": 0.0,
+                    "experience": 0.0,
+                    "keyword_adj": 0.0
+                },
+                "explanation": "Exclusion : Mot-clé interdit détecté",
+            }
 
         # Calcul de chaque critère de base
-        sector_s = self._sector_score(enterprise.sector, tender_sector)
-        budget_s = self._budget_score(enterprise.min_budget, enterprise.max_budget, tender_budget)
-        location_s = self._location_score(enterprise.zones, tender_location)
-        experience_s = self._experience_score(enterprise.experience_years, tender_text)
+        sector_s = self._sector_score(ctx, tender_sector)
+        if budget_s is None:
+            budget_s = self._budget_score(ctx.min_budget, ctx.max_budget, tender_budget)
+        location_s = self._location_score(ctx, tender_location)
+        experience_s = ctx.experience_score
 
         # Score pondéré de base
         base_weighted_score = (
@@ -216,8 +329,6 @@ class ScorerService:
             + experience_s * self.WEIGHTS["experience"]
         )
 
-        # Ajustement par mots-clés
-        kw_multiplier = self._keyword_score(enterprise, tender_text)
         final_score = base_weighted_score * kw_multiplier
 
         # Cap à 100
@@ -230,8 +341,6 @@ class ScorerService:
         explanation_parts.append(f"Zone: {location_s:.0%}")
         if kw_multiplier > 1.0:
             explanation_parts.append(f"Bonus Mots-clés: +{(kw_multiplier-1)*100:.0f}%")
-        elif kw_multiplier == 0:
-            explanation_parts.append("Exclusion : Mot-clé interdit détecté")
 
         explanation = " | ".join(explanation_parts)
 
@@ -247,39 +356,108 @@ class ScorerService:
             "explanation": explanation,
         }
 
-    def score_all_for_enterprise(self, enterprise: Enterprise) -> list[dict]:
+    def _load_scoring_rows(self) -> list[dict]:
         """
-        Calcule les scores pour tous les tenders analysés vs une entreprise.
-        Met à jour les analyses en base.
+        Charge les tenders analysés sous forme de valeurs simples (indépendantes
+        de la session), prêtes à être scorées.
+        Seules les colonnes utiles sont lues ; le texte (raw_text, sinon
+        description, sinon titre) est choisi côté SQL pour ne transférer
+        qu'une seule colonne volumineuse.
         """
-        analyses = self.db.query(Analysis).join(Tender).filter(
+        tender_text = func.coalesce(
+            func.nullif(Tender.raw_text, ""),
+            func.nullif(Tender.description, ""),
+            Tender.title,
+        )
+        records = self.db.query(Analysis).join(Analysis.tender).filter(
             Tender.is_analyzed == True  # noqa: E712
+        ).with_entities(
+            Analysis.id,
+            Tender.id,
+            Tender.title,
+            Tender.source_url,
+            Tender.sector,
+            Analysis.extracted_sector,
+            Tender.estimated_budget,
+            Analysis.extracted_budget,
+            Tender.location,
+            Analysis.extracted_location,
+            tender_text,
         ).all()
 
+        rows = []
+        for (analysis_id, tender_id, title, source_url, sector, ex_sector,
+             budget, ex_budget, location, ex_location, text) in records:
+            rows.append({
+                "analysis_id": analysis_id,
+                "tender_id": tender_id,
+                "tender_title": title,
+                "source_url": source_url or "",
+                "sector": sector or ex_sector or "",
+                "budget": budget or ex_budget,
+                "location": location or ex_location,
+                "text": (text or "").lower(),
+            })
+        return rows
+
+    def preload_tenders(self) -> None:
+        """
+        Précharge une seule fois les tenders analysés pour un lot d'entreprises.
+        Les appels suivants à score_all_for_enterprise travaillent en mémoire.
+        """
+        self._preloaded_rows = self._load_scoring_rows()
+        logger.info(f"📦 {len(self._preloaded_rows)} tenders préchargés pour le scoring")
+
+    def score_all_for_enterprise(self, enterprise: Enterprise, top_k: int | None = None) -> list[dict]:
+        """
+        Calcule les scores pour tous les tenders analysés vs une entreprise.
+        Met à jour les analyses en base.
+        Si `top_k` est fourni, seuls les `top_k` meilleurs résultats sont retournés
+        (toutes les analyses restent mises à jour).
+        """
+        rows = self._preloaded_rows if self._preloaded_rows is not None else self._load_scoring_rows()
+        ctx = self.build_context(enterprise)
+
         results = []
+        updates = []
+
+        # Scores budgétaires calculés en un seul appel pour tous les tenders
+        budgets = budget_scores(ctx.min_budget, ctx.max_budget, [row["budget"] for row in rows])
 
-        for analysis in analyses:
-            tender = analysis.tender
-            score_result = self.calculate_score(enterprise, tender, analysis)
+        # Locaux liés une fois : évite les résolutions d'attributs à chaque tender
+        enterprise_id = ctx.id
+        score_values = self._score_values
+
+        for row, budget_s in zip(rows, budgets):
+            score_result = score_values(
+                ctx, row["sector"], row["budget"], row["location"], row["text"], budget_s
+            )
 
             # Mettre à jour l'analyse
-            analysis.enterprise_id = enterprise.id
-            analysis.score = score_result["score"]
-            analysis.explanation = score_result["explanation"]
+            updates.append({
+                "id": row["analysis_id"],
+                "enterprise_id": enterprise_id,
+                "score": score_result["score"],
+                "explanation": score_result["explanation"],
+            })
 
             results.append({
-                "tender_id": tender.id,
-                "tender_title": tender.title,
+                "tender_id": row["tender_id"],
+                "tender_title": row["tender_title"],
                 "score": score_result["score"],
                 "details": score_result["details"],
                 "explanation": score_result["explanation"],
-                "source_url": tender.source_url or "",
+                "source_url": row["source_url"],
             })
 
+        if updates:
+            self.db.bulk_update_mappings(Analysis, updates)
         self.db.commit()
 
-        # Trier par score décroissant
-        results.sort(key=lambda x: x["score"], reverse=True)
-        logger.info(f"📊 {len(results)} scores calculés pour {enterprise.name}")
+        logger.info(f"📊 {len(results)} scores calculés pour {ctx.name}")
 
-        return results
\ No newline at end of file
+        # Trier par score décroissant (sélection partielle si seul le haut du classement sert)
+        if top_k:
+            return heapq.nlargest(top_k, results, key=lambda x: x["score"])
+        results.sort(key=lambda x: x["score"], reverse=True)
+        return results
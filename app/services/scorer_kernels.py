@@ -0,0 +1,39 @@
+# app/services/scorer_kernels.py
+"""
+Noyaux numériques du scoring : calculs ne dépendant que de nombres,
+appliqués en lot à tous les tenders d'une entreprise.
+"""
+
+
+def budget_score(min_budget: float, max_budget: float, estimated_budget: float | None) -> float:
+    """
+    Calcule l'adéquation budgétaire (0-1).
+    Score maximal si le budget estimé est dans la fourchette.
+    """
+    if not estimated_budget or estimated_budget <= 0:
+        return 0.5  # Score neutre si budget non disponible
+
+    if min_budget <= 0 and max_budget <= 0:
+        return 0.5  # Score neutre si pas de fourchette définie
+
+    # Dans la fourchette
+    if min_budget <= estimated_budget <= max_budget:
+        return 1.0
+
+    # Calcul de la proximité si hors fourchette
+    if max_budget > 0 and estimated_budget > max_budget:
+        # Budget trop élevé - pénalité progressive
+        ratio = max_budget / estimated_budget
+        return max(0.1, ratio)
+
+    if min_budget > 0 and estimated_budget < min_budget:
+        # Budget trop faible - pénalité progressive
+        ratio = estimated_budget / min_budget
+        return max(0.1, ratio)
+
+    return 0.5
+
+
+def budget_scores(min_budget: float, max_budget: float, estimated: list[float | None]) -> list[float]:
+    """Scores budgétaires de tous les tenders pour une même fourchette."""
+    return [budget_score(min_budget, max_budget, est) for est in estimated]
@@ -7,15 +7,31 @@ et stockage des appels d'offres en base.
 
 import os
 import logging
+import re
+import codecs
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+from itertools import groupby
+from operator import itemgetter
+from io import BytesIO
+from urllib.parse import quote_plus
 from pathlib import Path
 
+import lxml.html
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from lxml import etree
+from lxml.etree import ParserError, XPath
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 from sqlalchemy.orm import Session
 
+try:
+    import requests_cache  # Cache HTTP des pages (requirements.txt)
+except ImportError:  # Repli sur une session sans cache, memes pages (tests/test_scraper.py)
+    requests_cache = None
+
 from app.config import get_settings
 from app.models.tender import Tender
 
@@ -25,6 +41,11 @@ settings = get_settings()
 DOWNLOADS_DIR = Path("downloads")
 DOWNLOADS_DIR.mkdir(parents=True, exist_ok=True)
 
+# Taille maximale acceptee pour un PDF telecharge
+MAX_PDF_BYTES = 500 * 1024 * 1024
+# Taille des blocs lus / ecrits pendant le telechargement
+PDF_CHUNK_SIZE = 64 * 1024
+
 # Headers pour simuler un navigateur
 HEADERS = {
     "User-Agent": (
@@ -36,17 +57,314 @@ HEADERS = {
     "Accept-Language": "fr-FR,fr;q=0.9,en;q=0.5",
 }
 
+# Declaration d'encodage en tete de page
+_BOMS = (codecs.BOM_UTF8, codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)
+_META_CHARSET_RE = re.compile(rb"<meta[^>]+charset", re.IGNORECASE)
+
+# Duree de vie du cache HTTP des pages de listing (secondes)
+PAGE_CACHE_EXPIRE = 3600
+
+
+def _is_html_response(response: requests.Response) -> bool:
+    """Seules les pages HTML sont mises en cache (pas les PDF)."""
+    return "html" in response.headers.get("Content-Type", "")
+
+
+# XPath precompilees pour les parsers
+_TABLES = XPath("//table")
+_ROWS = XPath(".//tr")
+_CELLS = XPath(".//td")
+_OWNER_TABLE = XPath("ancestor::table[1]")
+_OUTER_ROW = XPath("ancestor::tr[1]")
+_FIRST_LINK = XPath("(.//a)[1]")
+_FIRST_P = XPath("(.//p)[1]")
+_FIRST_TITLE = XPath("(.//h1 | .//h2 | .//h3 | .//h4 | .//a)[1]")
+_LINKS_WITH_HREF = XPath("//a[@href]")
+# Seuls les elements portant un attribut class sont candidats aux filtres ci-dessous
+_CLASSED_ARTICLES_AND_DIVS = XPath("//article[@class] | //div[@class]")
+_CLASSED_H2 = XPath("//h2[@class]")
+_HEADINGS = XPath("//h1 | //h2 | //h3")
+# Texte visible : comme get_text() de BeautifulSoup, sans script/style/template/ruby
+_TEXT_NODES = XPath(
+    ".//text()[not(ancestor::script or ancestor::style or ancestor::template"
+    " or ancestor::rt or ancestor::rp)]",
+    smart_strings=False,
+)
+
+
+def _header_encoding(response: requests.Response) -> str | None:
+    """
+    Encodage annonce par le header Content-Type, seulement si un charset y figure
+    (get_encoding_from_headers renvoie ISO-8859-1 par defaut pour text/*).
+    """
+    if "charset" not in response.headers.get("Content-Type", "").lower():
+        return None
+    encoding = requests.utils.get_encoding_from_headers(response.headers)
+    try:
+        return codecs.lookup(encoding).name if encoding else None
+    except LookupError:
+        return None  # Charset inconnu : on laisse la page decider
+
+
+def _html_bytes(html: str | bytes, declared: str | None = None) -> tuple[bytes, str | None]:
+    """
+    Octets a donner a libxml2 et encodage a forcer.
+    Priorite comme un navigateur : BOM, puis charset du header HTTP (`declared`),
+    puis <meta charset> (detecte par libxml2 lui-meme) ; sinon UTF-8
+    (libxml2 supposerait ISO-8859-1).
+    """
+    if isinstance(html, str):
+        return html.encode("utf-8"), "utf-8"
+    if html.startswith(_BOMS):
+        return html, None
+    if declared:
+        return html, declared
+    if _META_CHARSET_RE.search(html, 0, 4096):
+        return html, None
+    return html, "utf-8"
+
+
+def _parse_html(html: str | bytes, declared: str | None = None):
+    """Construit l'arbre lxml d'une page (None si la page est vide)."""
+    data, encoding = _html_bytes(html, declared)
+    parser = lxml.html.HTMLParser(encoding=encoding) if encoding else None
+    try:
+        return lxml.html.document_fromstring(data, parser=parser)
+    except ParserError:
+        return None
+
+
+def _text(el) -> str:
+    """Texte d'un element, chaque fragment nettoye puis concatene (get_text(strip=True))."""
+    return "".join(t.strip() for t in _TEXT_NODES(el))
+
+
+def _first(xpath: XPath, el):
+    """Premier resultat d'une XPath ou None."""
+    found = xpath(el)
+    return found[0] if found else None
+
+
+# Suppression des accents pour le mapping secteur -> categories JAO
+_ACCENT_FOLD = str.maketrans("éèêàâôîûç", "eeeaaoiuc")
+
+# Filtres de classes CSS (appliques a l'attribut class en minuscules)
+_DGCMP_CLASS_RE = re.compile(r"tender|appel|offre|post|entry")
+_JAO_CLASS_RE = re.compile(r"post|entry")
+_ENTRY_TITLE_RE = re.compile(r"entry-title")
+
+# Annee (cellule Telemo) et annonces JAO qui ne sont pas des appels d'offres
+_YEAR_RE = re.compile(r"\d{4}")
+_JAO_REJECT_RE = re.compile(r"recrutement|avis d'attribution|résultats", re.IGNORECASE)
+
+
+def _with_class(elements: list, pattern: re.Pattern) -> list:
+    """Elements dont l'attribut class (en minuscules) correspond au motif."""
+    return [el for el in elements if pattern.search(el.get("class").lower())]
+
 
 class ScraperService:
     """Service de scraping des appels d'offres"""
 
+    # Mot-cle -> secteur (20 categories) ; le premier mot-cle trouve, dans cet ordre, l'emporte
+    SECTOR_KEYWORDS = {
+        # Agriculture, Pêche & Développement Rural
+        "agri": "Agriculture, Pêche & Développement Rural",
+        "pêche": "Agriculture, Pêche & Développement Rural",
+        "élevage": "Agriculture, Pêche & Développement Rural",
+        "rural": "Agriculture, Pêche & Développement Rural",
+        "semence": "Agriculture, Pêche & Développement Rural",
+        # Agroalimentaire & Transformation
+        "agroalimentaire": "Agroalimentaire & Transformation",
+        "transformation": "Agroalimentaire & Transformation",
+        "alimentaire": "Agroalimentaire & Transformation",
+        # Communication, Médias & Publicité
+        "communic": "Communication, Médias & Publicité",
+        "média": "Communication, Médias & Publicité",
+        "publicité": "Communication, Médias & Publicité",
+        "presse": "Communication, Médias & Publicité",
+        # Éducation & Formation
+        "éducation": "Éducation & Formation",
+        "enseign": "Éducation & Formation",
+        "formation": "Éducation & Formation",
+        "universit": "Éducation & Formation",
+        "scolaire": "Éducation & Formation",
+        # Energie, Eau & Environnement
+        "énergi": "Energie, Eau & Environnement",
+        "électri": "Energie, Eau & Environnement",
+        "solaire": "Energie, Eau & Environnement",
+        "eau": "Energie, Eau & Environnement",
+        "hydraulique": "Energie, Eau & Environnement",
+        "assainissement": "Energie, Eau & Environnement",
+        # Environnement, Forêts & Changement Climatique
+        "forêt": "Environnement, Forêts & Changement Climatique",
+        "climat": "Environnement, Forêts & Changement Climatique",
+        "reboisement": "Environnement, Forêts & Changement Climatique",
+        # Études & Consultances
+        "étude": "Études & Consultances",
+        "consultanc": "Études & Consultances",
+        "consultant": "Études & Consultances",
+        "audit": "Études & Consultances",
+        # Fournitures & Équipements
+        "fourniture": "Fournitures & Équipements",
+        "équipement": "Fournitures & Équipements",
+        "matériel": "Fournitures & Équipements",
+        "mobilier": "Fournitures & Équipements",
+        # Gouvernance & Administration Publique
+        "gouvern": "Gouvernance & Administration Publique",
+        "administrat": "Gouvernance & Administration Publique",
+        "institution": "Gouvernance & Administration Publique",
+        # Immobilier & Aménagement Urbain
+        "immobilier": "Immobilier & Aménagement Urbain",
+        "urbain": "Immobilier & Aménagement Urbain",
+        "aménagement": "Immobilier & Aménagement Urbain",
+        "lotissement": "Immobilier & Aménagement Urbain",
+        # Industrie & Commerce
+        "industri": "Industrie & Commerce",
+        "commerce": "Industrie & Commerce",
+        "usine": "Industrie & Commerce",
+        # Informatique & Télécommunications
+        "informatique": "Informatique & Télécommunications",
+        "telecom": "Informatique & Télécommunications",
+        "digital": "Informatique & Télécommunications",
+        "logiciel": "Informatique & Télécommunications",
+        "numérique": "Informatique & Télécommunications",
+        # Mines & Ressources Naturelles
+        "minier": "Mines & Ressources Naturelles",
+        "mines": "Mines & Ressources Naturelles",
+        "géologi": "Mines & Ressources Naturelles",
+        "ressources naturelles": "Mines & Ressources Naturelles",
+        # QSE
+        "qualité": "QSE - Qualité, Sécurité & Environnement",
+        "qse": "QSE - Qualité, Sécurité & Environnement",
+        "environ": "QSE - Qualité, Sécurité & Environnement",
+        # Santé & Paramédical
+        "santé": "Santé & Paramédical",
+        "médi": "Santé & Paramédical",
+        "pharmac": "Santé & Paramédical",
+        "hôpital": "Santé & Paramédical",
+        "paramédical": "Santé & Paramédical",
+        # Sécurité & Protection
+        "sécurité": "Sécurité & Protection",
+        "surveillance": "Sécurité & Protection",
+        "gardiennage": "Sécurité & Protection",
+        "défense": "Sécurité & Protection",
+        # Services Généraux & Prestations diverses
+        "nettoyage": "Services Généraux & Prestations diverses",
+        "entretien": "Services Généraux & Prestations diverses",
+        "prestation": "Services Généraux & Prestations diverses",
+        "service": "Services Généraux & Prestations diverses",
+        # Tourisme, Culture & Loisirs
+        "tourisme": "Tourisme, Culture & Loisirs",
+        "culture": "Tourisme, Culture & Loisirs",
+        "hôtel": "Tourisme, Culture & Loisirs",
+        # Transport & Logistique
+        "transport": "Transport & Logistique",
+        "logistique": "Transport & Logistique",
+        "véhicule": "Transport & Logistique",
+        # Travaux Publics & Construction
+        "travaux": "Travaux Publics & Construction",
+        "constru": "Travaux Publics & Construction",
+        "route": "Travaux Publics & Construction",
+        "bâtiment": "Travaux Publics & Construction",
+        "génie civil": "Travaux Publics & Construction",
+        "infrastr": "Travaux Publics & Construction",
+    }
+
+    # Un motif compilé par groupe consécutif de mots-clés d'un même secteur (ordre conservé)
+    _SECTOR_GUESS_PATTERNS = [
+        (sector, re.compile("|".join(re.escape(keyword) for keyword, _ in group)))
+        for sector, group in groupby(SECTOR_KEYWORDS.items(), key=itemgetter(1))
+    ]
+
+    # Categories JAO (chemin relatif a JAO_BASE_URL)
+    JAO_CATEGORY_PATHS = {
+        "Travaux Publics & Construction": "/category/appels-d-offres/travaux-publics-construction/",
+        "Sante & Paramedical": "/category/appels-d-offres/sante-medicaments/",
+        "Informatique & Telecommunications": "/category/appels-d-offres/informatique-telecommunications/",
+        "Services Generaux & Prestations diverses": "/category/appels-d-offres/services-generaux-prestations-diverses/",
+        "Agriculture, Peche & Developpement Rural": "/category/appels-d-offres/agriculture-peche-developpement-rural/",
+        "Education & Formation": "/category/appels-d-offres/education-formation/",
+        "Energie, Eau & Environnement": "/category/appels-d-offres/energie-eau-environnement/",
+        "Transport & Logistique": "/category/appels-d-offres/transport-logistique/",
+        "Fournitures & Equipements": "/category/appels-d-offres/fournitures-equipements/",
+        "Etudes & Consultances": "/category/appels-d-offres/etudes-consultances/",
+        "Mines & Ressources Naturelles": "/category/appels-d-offres/mines-ressources-naturelles/",
+    }
+
+    # Mapping secteur entreprise (sans accents) -> categorie(s) JAO
+    SECTOR_TO_JAO = {
+        "travaux": ["Travaux Publics & Construction"],
+        "construction": ["Travaux Publics & Construction"],
+        "btp": ["Travaux Publics & Construction"],
+        "batiment": ["Travaux Publics & Construction"],
+        "genie civil": ["Travaux Publics & Construction"],
+        "sante": ["Sante & Paramedical"],
+        "medical": ["Sante & Paramedical"],
+        "pharma": ["Sante & Paramedical"],
+        "hopital": ["Sante & Paramedical"],
+        "informatique": ["Informatique & Telecommunications"],
+        "telecom": ["Informatique & Telecommunications"],
+        "digital": ["Informatique & Telecommunications"],
+        "numerique": ["Informatique & Telecommunications"],
+        "logiciel": ["Informatique & Telecommunications"],
+        "service": ["Services Generaux & Prestations diverses"],
+        "nettoyage": ["Services Generaux & Prestations diverses"],
+        "entretien": ["Services Generaux & Prestations diverses"],
+        "prestation": ["Services Generaux & Prestations diverses"],
+        "agri": ["Agriculture, Peche & Developpement Rural"],
+        "peche": ["Agriculture, Peche & Developpement Rural"],
+        "elevage": ["Agriculture, Peche & Developpement Rural"],
+        "rural": ["Agriculture, Peche & Developpement Rural"],
+        "education": ["Education & Formation"],
+        "formation": ["Education & Formation"],
+        "enseign": ["Education & Formation"],
+        "universit": ["Education & Formation"],
+        "scolaire": ["Education & Formation"],
+        "energie": ["Energie, Eau & Environnement"],
+        "electri": ["Energie, Eau & Environnement"],
+        "eau": ["Energie, Eau & Environnement"],
+        "solaire": ["Energie, Eau & Environnement"],
+        "environnement": ["Energie, Eau & Environnement"],
+        "transport": ["Transport & Logistique"],
+        "logistique": ["Transport & Logistique"],
+        "vehicule": ["Transport & Logistique"],
+        "fourniture": ["Fournitures & Equipements"],
+        "equipement": ["Fournitures & Equipements"],
+        "materiel": ["Fournitures & Equipements"],
+        "mobilier": ["Fournitures & Equipements"],
+        "etude": ["Etudes & Consultances"],
+        "consultanc": ["Etudes & Consultances"],
+        "consultant": ["Etudes & Consultances"],
+        "audit": ["Etudes & Consultances"],
+        "mine": ["Mines & Ressources Naturelles"],
+        "minier": ["Mines & Ressources Naturelles"],
+        "geologi": ["Mines & Ressources Naturelles"],
+    }
+    _JAO_KEYWORD_RE = re.compile("|".join(re.escape(keyword) for keyword in SECTOR_TO_JAO))
+
     def __init__(self, db: Session):
         self.db = db
         self.base_url = settings.DGCMP_BASE_URL
         self.telemo_url = settings.TELEMO_BASE_URL
         self.jao_url = settings.JAO_BASE_URL
-        self.session = requests.Session()
+        if requests_cache is not None:
+            # Pages de listing en cache ; a l'expiration, revalidation via ETag / Last-Modified (304)
+            self.session = requests_cache.CachedSession(
+                cache_name=str(DOWNLOADS_DIR / "scraper_cache"),
+                backend="sqlite",
+                expire_after=PAGE_CACHE_EXPIRE,
+                filter_fn=_is_html_response,
+            )
+        else:
+            self.session = requests.Session()
         self.session.headers.update(HEADERS)
+        self.session.headers["Connection"] = "keep-alive"
+        # Pool de connexions : les categories JAO partagent le meme hote (un seul handshake TLS)
+        # Les retries restent geres par tenacity dans _fetch_page / _download_pdf
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
 
     @retry(
         stop=stop_after_attempt(3),
@@ -56,15 +374,36 @@ class ScraperService:
             f"Retry {retry_state.attempt_number}/3 - Scraping échoué, nouvelle tentative..."
         ),
     )
-    def _fetch_page(self, url: str, timeout: int = 30) -> str:
+    def _fetch_page(self, url: str, timeout: int = 30) -> tuple[bytes, str | None]:
         """
-        Récupère le contenu HTML d'une page avec retry automatique.
+        Récupère le contenu HTML brut (octets) d'une page avec retry automatique.
         3 tentatives avec backoff exponentiel.
+        Retourne aussi le charset du header Content-Type (None s'il n'y en a pas) ;
+        le décodage est laissé à libxml2 au moment du parsing.
         """
         logger.info(f"📡 Fetching: {url}")
         response = self.session.get(url, timeout=timeout)
         response.raise_for_status()
-        return response.text
+        return response.content, _header_encoding(response)
+
+    def _fetch_pages(
+        self, requests_list: list[tuple[str, int]]
+    ) -> list[tuple[bytes, str | None] | Exception]:
+        """
+        Récupère plusieurs pages en parallèle (I/O uniquement) via la session partagée.
+        Retourne, dans l'ordre des URLs, (HTML brut, charset du header) ou l'exception levée.
+        """
+        def fetch(item: tuple[str, int]) -> tuple[bytes, str | None] | Exception:
+            url, timeout = item
+            try:
+                return self._fetch_page(url, timeout=timeout)
+            except Exception as e:
+                return e
+
+        if not requests_list:
+            return []
+        with ThreadPoolExecutor(max_workers=min(16, len(requests_list))) as executor:
+            return list(executor.map(fetch, requests_list))
 
     @retry(
         stop=stop_after_attempt(3),
@@ -76,21 +415,40 @@ class ScraperService:
         Télécharge un fichier PDF et le sauvegarde localement.
         Retourne le chemin du fichier ou None en cas d'échec.
         """
+        tmp_path = None
         try:
             logger.info(f"📥 Downloading PDF: {url}")
             response = self.session.get(url, timeout=timeout, stream=True)
             response.raise_for_status()
 
             # Nom de fichier basé sur le hash de l'URL
-            filename = hashlib.md5(url.encode()).hexdigest() + ".pdf"
+            filename = hashlib.blake2b(url.encode(), digest_size=16).hexdigest() + ".pdf"
             filepath = DOWNLOADS_DIR / filename
 
-            with open(filepath, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
+            chunks = (chunk for chunk in response.iter_content(chunk_size=PDF_CHUNK_SIZE) if chunk)
+            first = next(chunks, b"")
+
+            # Vérifier la signature avant d'écrire (pages HTML d'erreur / d'accès refusé)
+            if not first.startswith(b"%PDF"):
+                logger.warning(f"⚠️ Contenu non PDF ignoré: {url}")
+                return None
+
+            # Écriture dans un fichier temporaire puis renommage atomique
+            tmp_path = filepath.with_suffix(".pdf.tmp")
+            file_size = len(first)
+            # Pas de tampon Python : les blocs recus sont deja de 64 Ko
+            with open(tmp_path, "wb", buffering=0) as f:
+                if hasattr(os, "posix_fadvise"):
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                f.write(first)
+                for chunk in chunks:
+                    file_size += len(chunk)
+                    if file_size > MAX_PDF_BYTES:
+                        raise ValueError(f"PDF trop volumineux (> {MAX_PDF_BYTES} bytes)")
+                    f.write(chunk)
+            os.replace(tmp_path, filepath)
+            tmp_path = None
 
-            file_size = filepath.stat().st_size
             logger.info(f"✅ PDF sauvegardé: {filepath} ({file_size} bytes)")
             return str(filepath)
 
@@ -98,37 +456,42 @@ class ScraperService:
             logger.error(f"❌ Échec téléchargement PDF {url}: {e}")
             return None
 
+        finally:
+            if tmp_path is not None:
+                tmp_path.unlink(missing_ok=True)
+
+    def download_pdfs(self, urls: list[str]) -> list[str | None]:
+        """
+        Télécharge plusieurs PDF en parallèle (I/O uniquement) via la session partagée.
+        Retourne les chemins locaux (ou None) dans l'ordre des URLs.
+        """
+        if not urls:
+            return []
+        with ThreadPoolExecutor(max_workers=min(16, len(urls))) as executor:
+            return list(executor.map(self._download_pdf, urls))
+
     # ──────────────────────────────────────────────
     #  PARSERS DGCMP (source originale)
     # ──────────────────────────────────────────────
 
-    def _parse_dgcmp_listings(self, html: str) -> list[dict]:
+    def _parse_dgcmp_listings(self, html: str | bytes, encoding: str | None = None) -> list[dict]:
         """
         Parse la page HTML DGCMP pour extraire les appels d'offres.
+        `encoding` : charset annoncé par le serveur (header Content-Type), s'il y en a un.
         """
-        soup = BeautifulSoup(html, "html.parser")
-        tenders = []
+        # Stratégie 1 : Recherche dans les tableaux (lecture en flux, ligne par ligne)
+        tenders = self._stream_table_rows(html, self.base_url, encoding)
+        if tenders:
+            return tenders
 
-        # Stratégie 1 : Recherche dans les tableaux
-        tables = soup.find_all("table")
-        for table in tables:
-            rows = table.find_all("tr")
-            for row in rows[1:]:  # Skip header
-                cells = row.find_all("td")
-                if len(cells) >= 2:
-                    tender_data = self._extract_from_table_row(cells, self.base_url)
-                    if tender_data:
-                        tenders.append(tender_data)
+        # Les stratégies de repli ont besoin de l'arbre complet
+        root = _parse_html(html, encoding)
+        if root is None:
+            return []
 
         # Stratégie 2 : Recherche dans les articles/divs
         if not tenders:
-            articles = soup.find_all(["article", "div"], class_=lambda c: c and (
-                "tender" in str(c).lower() or
-                "appel" in str(c).lower() or
-                "offre" in str(c).lower() or
-                "post" in str(c).lower() or
-                "entry" in str(c).lower()
-            ))
+            articles = _with_class(_CLASSED_ARTICLES_AND_DIVS(root), _DGCMP_CLASS_RE)
             for article in articles:
                 tender_data = self._extract_from_article(article, self.base_url)
                 if tender_data:
@@ -136,40 +499,76 @@ class ScraperService:
 
         # Stratégie 3 : Recherche de tous les liens PDF
         if not tenders:
-            tenders = self._extract_pdf_links(soup, self.base_url)
+            tenders = self._extract_pdf_links(root, self.base_url)
+
+        return tenders
 
+    def _stream_table_rows(
+        self, html: str | bytes, base_url: str, encoding: str | None = None
+    ) -> list[dict]:
+        """
+        Extrait les lignes de tableaux sans garder tout le DOM en memoire :
+        chaque <tr> est traite a sa fermeture puis libere.
+        La premiere ligne de chaque tableau (en-tete) est ignoree.
+        """
+        tenders = []
+        seen_tables = set()
+        data, encoding = _html_bytes(html, encoding)
+        try:
+            for _, row in etree.iterparse(
+                BytesIO(data), events=("end",), tag="tr", html=True, encoding=encoding
+            ):
+                table = _first(_OWNER_TABLE, row)
+                if table is not None:
+                    if table not in seen_tables:
+                        seen_tables.add(table)  # Skip header
+                    else:
+                        cells = _CELLS(row)
+                        if len(cells) >= 2:
+                            tender_data = self._extract_from_table_row(cells, base_url)
+                            if tender_data:
+                                tenders.append(tender_data)
+
+                # Liberer la ligne et les precedentes (sauf ligne imbriquee, encore utile au parent)
+                if _first(_OUTER_ROW, row) is None:
+                    row.clear()
+                    parent = row.getparent()
+                    while row.getprevious() is not None:
+                        del parent[0]
+        except etree.XMLSyntaxError:
+            pass  # Document vide
         return tenders
 
     # ──────────────────────────────────────────────
     #  PARSER TELEMO (portail guinéen)
     # ──────────────────────────────────────────────
 
-    def _parse_telemo_listings(self, html: str) -> list[dict]:
+    def _parse_telemo_listings(self, html: str | bytes, encoding: str | None = None) -> list[dict]:
         """
         Parse la page Telemo pour extraire les plans de passation de marchés.
         """
-        soup = BeautifulSoup(html, "html.parser")
+        root = _parse_html(html, encoding)
+        if root is None:
+            return []
         tenders = []
 
-        tables = soup.find_all("table")
-        for table in tables:
-            rows = table.find_all("tr")
-            for row in rows:
-                cells = row.find_all("td")
+        for table in _TABLES(root):
+            for row in _ROWS(table):
+                cells = _CELLS(row)
                 if len(cells) >= 2:
                     year_text = ""
                     entity_text = ""
                     link_href = None
 
                     for cell in cells:
-                        text = cell.get_text(strip=True)
-                        link = cell.find("a")
-                        if link and link.get("href"):
-                            href = link["href"]
+                        text = _text(cell)
+                        link = _first(_FIRST_LINK, cell)
+                        if link is not None and link.get("href"):
+                            href = link.get("href")
                             if not href.startswith("javascript:"):
                                 link_href = href if href.startswith("http") else f"{self.telemo_url}{href}"
 
-                        if text and text.isdigit() and len(text) == 4:
+                        if _YEAR_RE.fullmatch(text):
                             year_text = text
                         elif text and len(text) > 5:
                             entity_text = text
@@ -180,8 +579,7 @@ class ScraperService:
                         if link_href and link_href.startswith("http"):
                             source_url = link_href
                         else:
-                            import urllib.parse
-                            q = urllib.parse.quote_plus(f"plan passation marche {year_text} {entity_text} Guinee")
+                            q = quote_plus(f"plan passation marche {year_text} {entity_text} Guinee")
                             source_url = f"https://www.google.com/search?q={q}"
 
                         tenders.append({
@@ -199,41 +597,44 @@ class ScraperService:
     #  PARSER JAO GUINÉE (Journal Officiel)
     # ──────────────────────────────────────────────
 
-    def _parse_jao_listings(self, html: str, category: str = None) -> list[dict]:
+    def _parse_jao_listings(
+        self, html: str | bytes, category: str = None, encoding: str | None = None
+    ) -> list[dict]:
         """
         Parse la page JAO Guinée pour extraire les appels d'offres.
         Format : Articles Wordpress avec titre et lien.
         """
-        soup = BeautifulSoup(html, "html.parser")
+        root = _parse_html(html, encoding)
         tenders = []
+        articles = []
+
+        if root is not None:
+            # JAO utilise souvent des structures d'articles Wordpress standard
+            articles = _with_class(_CLASSED_ARTICLES_AND_DIVS(root), _JAO_CLASS_RE)
 
-        # JAO utilise souvent des structures d'articles Wordpress standard
-        articles = soup.find_all(["article", "div"], class_=lambda c: c and ("post" in str(c).lower() or "entry" in str(c).lower()))
-        
-        if not articles:
-            # Fallback simple
-            articles = soup.find_all("h2", class_=lambda c: c and "entry-title" in str(c).lower())
             if not articles:
-                articles = soup.find_all(["h1", "h2", "h3"])
+                # Fallback simple
+                articles = _with_class(_CLASSED_H2(root), _ENTRY_TITLE_RE)
+                if not articles:
+                    articles = _HEADINGS(root)
 
         for article in articles:
-            link = article.find("a")
-            if not link or not link.get("href"):
+            link = _first(_FIRST_LINK, article)
+            if link is None or not link.get("href"):
                 continue
 
-            title = link.get_text(strip=True)
+            title = _text(link)
             if not title or len(title) < 10:
                 continue
 
+            # Minuscules calculées une fois : filtre de rejet + devinette du secteur
+            title_lower = title.lower()
+
             # Ignorer les articles qui ne sont pas des appels d'offres (ex: actualités gérnérales)
-            if any(kw in title.lower() for kw in ["recrutement", "avis d'attribution", "résultats"]):
+            if _JAO_REJECT_RE.search(title_lower):
                 continue
 
-            source_url = link["href"]
-            
-            # Tenter d'extraire la date
-            date_tag = article.find(["span", "time"], class_=lambda c: c and "date" in str(c).lower())
-            date_str = date_tag.get_text(strip=True) if date_tag else None
+            source_url = link.get("href")
 
             tenders.append({
                 "title": title[:500],
@@ -241,7 +642,7 @@ class ScraperService:
                 "source_url": source_url,
                 "deadline_str": None, # JAO ne met pas souvent la deadline dans le titre
                 "location": "Guinée",
-                "sector": category or self._guess_sector(title),
+                "sector": category or self._guess_sector_lower(title_lower),
             })
 
         logger.info(f"✅ JAO: {len(tenders)} tenders trouvés")
@@ -249,112 +650,14 @@ class ScraperService:
 
     def _guess_sector(self, text: str) -> str | None:
         """Devine le secteur à partir d'un texte (20 catégories)."""
-        text_lower = text.lower()
-        sector_map = {
-            # Agriculture, Pêche & Développement Rural
-            "agri": "Agriculture, Pêche & Développement Rural",
-            "pêche": "Agriculture, Pêche & Développement Rural",
-            "élevage": "Agriculture, Pêche & Développement Rural",
-            "rural": "Agriculture, Pêche & Développement Rural",
-            "semence": "Agriculture, Pêche & Développement Rural",
-            # Agroalimentaire & Transformation
-            "agroalimentaire": "Agroalimentaire & Transformation",
-            "transformation": "Agroalimentaire & Transformation",
-            "alimentaire": "Agroalimentaire & Transformation",
-            # Communication, Médias & Publicité
-            "communic": "Communication, Médias & Publicité",
-            "média": "Communication, Médias & Publicité",
-            "publicité": "Communication, Médias & Publicité",
-            "presse": "Communication, Médias & Publicité",
-            # Éducation & Formation
-            "éducation": "Éducation & Formation",
-            "enseign": "Éducation & Formation",
-            "formation": "Éducation & Formation",
-            "universit": "Éducation & Formation",
-            "scolaire": "Éducation & Formation",
-            # Energie, Eau & Environnement
-            "énergi": "Energie, Eau & Environnement",
-            "électri": "Energie, Eau & Environnement",
-            "solaire": "Energie, Eau & Environnement",
-            "eau": "Energie, Eau & Environnement",
-            "hydraulique": "Energie, Eau & Environnement",
-            "assainissement": "Energie, Eau & Environnement",
-            # Environnement, Forêts & Changement Climatique
-            "forêt": "Environnement, Forêts & Changement Climatique",
-            "climat": "Environnement, Forêts & Changement Climatique",
-            "reboisement": "Environnement, Forêts & Changement Climatique",
-            # Études & Consultances
-            "étude": "Études & Consultances",
-            "consultanc": "Études & Consultances",
-            "consultant": "Études & Consultances",
-            "audit": "Études & Consultances",
-            # Fournitures & Équipements
-            "fourniture": "Fournitures & Équipements",
-            "équipement": "Fournitures & Équipements",
-            "matériel": "Fournitures & Équipements",
-            "mobilier": "Fournitures & Équipements",
-            # Gouvernance & Administration Publique
-            "gouvern": "Gouvernance & Administration Publique",
-            "administrat": "Gouvernance & Administration Publique",
-            "institution": "Gouvernance & Administration Publique",
-            # Immobilier & Aménagement Urbain
-            "immobilier": "Immobilier & Aménagement Urbain",
-            "urbain": "Immobilier & Aménagement Urbain",
-            "aménagement": "Immobilier & Aménagement Urbain",
-            "lotissement": "Immobilier & Aménagement Urbain",
-            # Industrie & Commerce
-            "industri": "Industrie & Commerce",
-            "commerce": "Industrie & Commerce",
-            "usine": "Industrie & Commerce",
-            # Informatique & Télécommunications
-            "informatique": "Informatique & Télécommunications",
-            "telecom": "Informatique & Télécommunications",
-            "digital": "Informatique & Télécommunications",
-            "logiciel": "Informatique & Télécommunications",
-            "numérique": "Informatique & Télécommunications",
-            # Mines & Ressources Naturelles
-            "minier": "Mines & Ressources Naturelles",
-            "mines": "Mines & Ressources Naturelles",
-            "géologi": "Mines & Ressources Naturelles",
-            "ressources naturelles": "Mines & Ressources Naturelles",
-            # QSE
-            "qualité": "QSE - Qualité, Sécurité & Environnement",
-            "qse": "QSE - Qualité, Sécurité & Environnement",
-            "environ": "QSE - Qualité, Sécurité & Environnement",
-            # Santé & Paramédical
-            "santé": "Santé & Paramédical",
-            "médi": "Santé & Paramédical",
-            "pharmac": "Santé & Paramédical",
-            "hôpital": "Santé & Paramédical",
-            "paramédical": "Santé & Paramédical",
-            # Sécurité & Protection
-            "sécurité": "Sécurité & Protection",
-            "surveillance": "Sécurité & Protection",
-            "gardiennage": "Sécurité & Protection",
-            "défense": "Sécurité & Protection",
-            # Services Généraux & Prestations diverses
-            "nettoyage": "Services Généraux & Prestations diverses",
-            "entretien": "Services Généraux & Prestations diverses",
-            "prestation": "Services Généraux & Prestations diverses",
-            "service": "Services Généraux & Prestations diverses",
-            # Tourisme, Culture & Loisirs
-            "tourisme": "Tourisme, Culture & Loisirs",
-            "culture": "Tourisme, Culture & Loisirs",
-            "hôtel": "Tourisme, Culture & Loisirs",
-            # Transport & Logistique
-            "transport": "Transport & Logistique",
-            "logistique": "Transport & Logistique",
-            "véhicule": "Transport & Logistique",
-            # Travaux Publics & Construction
-            "travaux": "Travaux Publics & Construction",
-            "constru": "Travaux Publics & Construction",
-            "route": "Travaux Publics & Construction",
-            "bâtiment": "Travaux Publics & Construction",
-            "génie civil": "Travaux Publics & Construction",
-            "infrastr": "Travaux Publics & Construction",
-        }
-        for keyword, sector in sector_map.items():
-            if keyword in text_lower:
+        return self._guess_sector_lower(text.lower())
+
+    @classmethod
+    @lru_cache(maxsize=4096)
+    def _guess_sector_lower(cls, text_lower: str) -> str:
+        """Comme _guess_sector, pour un texte déjà en minuscules."""
+        for sector, pattern in cls._SECTOR_GUESS_PATTERNS:
+            if pattern.search(text_lower):
                 return sector
         return "Services Généraux & Prestations diverses"
 
@@ -366,26 +669,26 @@ class ScraperService:
         """Extrait les données d'une ligne de tableau"""
         try:
             title_cell = cells[0]
-            link = title_cell.find("a")
-            title = title_cell.get_text(strip=True)
+            link = _first(_FIRST_LINK, title_cell)
+            title = _text(title_cell)
 
             if not title or len(title) < 5:
                 return None
 
             source_url = ""
-            if link and link.get("href"):
-                href = link["href"]
+            if link is not None and link.get("href"):
+                href = link.get("href")
                 source_url = href if href.startswith("http") else f"{base_url}{href}"
             else:
                 return None
 
             description = ""
             if len(cells) > 1:
-                description = cells[1].get_text(strip=True)
+                description = _text(cells[1])
 
             deadline_str = None
             if len(cells) > 2:
-                deadline_str = cells[2].get_text(strip=True)
+                deadline_str = _text(cells[2])
 
             return {
                 "title": title[:500],
@@ -401,23 +704,23 @@ class ScraperService:
     def _extract_from_article(self, article, base_url: str) -> dict | None:
         """Extrait les données d'un article/div"""
         try:
-            title_tag = article.find(["h1", "h2", "h3", "h4", "a"])
-            if not title_tag:
+            title_tag = _first(_FIRST_TITLE, article)
+            if title_tag is None:
                 return None
 
-            title = title_tag.get_text(strip=True)
+            title = _text(title_tag)
             if not title or len(title) < 5:
                 return None
 
-            link = article.find("a")
-            if not link or not link.get("href"):
+            link = _first(_FIRST_LINK, article)
+            if link is None or not link.get("href"):
                 return None
 
-            href = link["href"]
+            href = link.get("href")
             source_url = href if href.startswith("http") else f"{base_url}{href}"
 
-            desc_tag = article.find("p")
-            description = desc_tag.get_text(strip=True) if desc_tag else None
+            desc_tag = _first(_FIRST_P, article)
+            description = _text(desc_tag) if desc_tag is not None else None
 
             return {
                 "title": title[:500],
@@ -430,15 +733,14 @@ class ScraperService:
             logger.debug(f"Erreur extraction article: {e}")
             return None
 
-    def _extract_pdf_links(self, soup: BeautifulSoup, base_url: str) -> list[dict]:
+    def _extract_pdf_links(self, root, base_url: str) -> list[dict]:
         """Extrait tous les liens PDF de la page"""
         tenders = []
-        links = soup.find_all("a", href=True)
 
-        for link in links:
-            href = link["href"]
+        for link in _LINKS_WITH_HREF(root):
+            href = link.get("href")
             if href.lower().endswith(".pdf"):
-                title = link.get_text(strip=True) or href.split("/")[-1]
+                title = _text(link) or href.split("/")[-1]
                 url = href if href.startswith("http") else f"{base_url}{href}"
                 tenders.append({
                     "title": title[:500],
@@ -449,12 +751,15 @@ class ScraperService:
 
         return tenders
 
-    def _tender_exists(self, source_url: str) -> bool:
-        """Vérifie si un appel d'offres existe déjà en base"""
-        existing = self.db.query(Tender).filter(
-            Tender.source_url == source_url
-        ).first()
-        return existing is not None
+    def _existing_source_urls(self, source_urls: list[str], batch_size: int = 500) -> set[str]:
+        """Retourne les URLs déjà présentes en base (une requête IN par lot)."""
+        existing = set()
+        for i in range(0, len(source_urls), batch_size):
+            batch = source_urls[i:i + batch_size]
+            existing.update(
+                url for (url,) in self.db.query(Tender.source_url).filter(Tender.source_url.in_(batch))
+            )
+        return existing
 
     def _parse_deadline(self, deadline_str: str | None) -> datetime | None:
         """Tente de parser une date limite"""
@@ -483,74 +788,15 @@ class ScraperService:
         Mappe les secteurs des entreprises inscrites vers les categories JAO correspondantes.
         Retourne seulement les categories pertinentes.
         """
-        all_jao_categories = {
-            "Travaux Publics & Construction": f"{self.jao_url}/category/appels-d-offres/travaux-publics-construction/",
-            "Sante & Paramedical": f"{self.jao_url}/category/appels-d-offres/sante-medicaments/",
-            "Informatique & Telecommunications": f"{self.jao_url}/category/appels-d-offres/informatique-telecommunications/",
-            "Services Generaux & Prestations diverses": f"{self.jao_url}/category/appels-d-offres/services-generaux-prestations-diverses/",
-            "Agriculture, Peche & Developpement Rural": f"{self.jao_url}/category/appels-d-offres/agriculture-peche-developpement-rural/",
-            "Education & Formation": f"{self.jao_url}/category/appels-d-offres/education-formation/",
-            "Energie, Eau & Environnement": f"{self.jao_url}/category/appels-d-offres/energie-eau-environnement/",
-            "Transport & Logistique": f"{self.jao_url}/category/appels-d-offres/transport-logistique/",
-            "Fournitures & Equipements": f"{self.jao_url}/category/appels-d-offres/fournitures-equipements/",
-            "Etudes & Consultances": f"{self.jao_url}/category/appels-d-offres/etudes-consultances/",
-            "Mines & Ressources Naturelles": f"{self.jao_url}/category/appels-d-offres/mines-ressources-naturelles/",
-        }
-
-        # Mapping secteur entreprise -> categorie(s) JAO
-        sector_to_jao = {
-            "travaux": ["Travaux Publics & Construction"],
-            "construction": ["Travaux Publics & Construction"],
-            "btp": ["Travaux Publics & Construction"],
-            "batiment": ["Travaux Publics & Construction"],
-            "genie civil": ["Travaux Publics & Construction"],
-            "sante": ["Sante & Paramedical"],
-            "medical": ["Sante & Paramedical"],
-            "pharma": ["Sante & Paramedical"],
-            "hopital": ["Sante & Paramedical"],
-            "informatique": ["Informatique & Telecommunications"],
-            "telecom": ["Informatique & Telecommunications"],
-            "digital": ["Informatique & Telecommunications"],
-            "numerique": ["Informatique & Telecommunications"],
-            "logiciel": ["Informatique & Telecommunications"],
-            "service": ["Services Generaux & Prestations diverses"],
-            "nettoyage": ["Services Generaux & Prestations diverses"],
-            "entretien": ["Services Generaux & Prestations diverses"],
-            "prestation": ["Services Generaux & Prestations diverses"],
-            "agri": ["Agriculture, Peche & Developpement Rural"],
-            "peche": ["Agriculture, Peche & Developpement Rural"],
-            "elevage": ["Agriculture, Peche & Developpement Rural"],
-            "rural": ["Agriculture, Peche & Developpement Rural"],
-            "education": ["Education & Formation"],
-            "formation": ["Education & Formation"],
-            "enseign": ["Education & Formation"],
-            "universit": ["Education & Formation"],
-            "scolaire": ["Education & Formation"],
-            "energie": ["Energie, Eau & Environnement"],
-            "electri": ["Energie, Eau & Environnement"],
-            "eau": ["Energie, Eau & Environnement"],
-            "solaire": ["Energie, Eau & Environnement"],
-            "environnement": ["Energie, Eau & Environnement"],
-            "transport": ["Transport & Logistique"],
-            "logistique": ["Transport & Logistique"],
-            "vehicule": ["Transport & Logistique"],
-            "fourniture": ["Fournitures & Equipements"],
-            "equipement": ["Fournitures & Equipements"],
-            "materiel": ["Fournitures & Equipements"],
-            "mobilier": ["Fournitures & Equipements"],
-            "etude": ["Etudes & Consultances"],
-            "consultanc": ["Etudes & Consultances"],
-            "consultant": ["Etudes & Consultances"],
-            "audit": ["Etudes & Consultances"],
-            "mine": ["Mines & Ressources Naturelles"],
-            "minier": ["Mines & Ressources Naturelles"],
-            "geologi": ["Mines & Ressources Naturelles"],
-        }
+        all_jao_categories = {cat: f"{self.jao_url}{path}" for cat, path in self.JAO_CATEGORY_PATHS.items()}
 
         matched_categories = {}
         for e_sector in enterprise_sectors:
-            e_lower = e_sector.lower().replace('é', 'e').replace('è', 'e').replace('ê', 'e').replace('à', 'a').replace('â', 'a').replace('ô', 'o').replace('î', 'i').replace('û', 'u').replace('ç', 'c').replace('&', '&')
-            for keyword, jao_cats in sector_to_jao.items():
+            e_lower = e_sector.lower().translate(_ACCENT_FOLD)
+            # Rejet rapide : aucun mot-cle dans ce secteur
+            if not self._JAO_KEYWORD_RE.search(e_lower):
+                continue
+            for keyword, jao_cats in self.SECTOR_TO_JAO.items():
                 if keyword in e_lower:
                     for cat in jao_cats:
                         if cat in all_jao_categories:
@@ -563,6 +809,31 @@ class ScraperService:
         logger.info(f"Scraping intelligent: {len(matched_categories)} categories pour {len(enterprise_sectors)} secteur(s): {list(matched_categories.keys())}")
         return matched_categories
 
+    def _insert_tenders(self, tenders: list[Tender]) -> list[Tender]:
+        """
+        Insertion groupée : un seul flush (INSERT multi-lignes) au lieu d'un par tender.
+        Si le lot échoue (ex: URL insérée entre-temps par un autre scraping),
+        repli tender par tender dans des savepoints : seuls les fautifs sont écartés.
+        Retourne les tenders effectivement insérés.
+        """
+        try:
+            self.db.add_all(tenders)
+            self.db.flush()
+            return tenders
+        except Exception as e:
+            self.db.rollback()
+            logger.warning(f"Echec de l'insertion groupee ({e}), insertion tender par tender")
+
+        inserted = []
+        for tender in tenders:
+            try:
+                with self.db.begin_nested():
+                    self.db.add(tender)
+                inserted.append(tender)
+            except Exception as e:
+                logger.error(f"Erreur tender '{tender.title}': {e}")
+        return inserted
+
     def scrape_tenders(self) -> list[Tender]:
         """
         Point d'entree principal : scrape les appels d'offres.
@@ -586,60 +857,87 @@ class ScraperService:
         # Source 1 : JAO Guinee (scraping INTELLIGENT par secteur)
         jao_categories = self._map_enterprise_sector_to_jao_categories(enterprise_sectors)
 
-        for cat, url in jao_categories.items():
+        # Source 2 : DGCMP / Source 3 : Telemo
+        telemo_plan_url = f"{self.telemo_url}/eb/bpp/selectPageProcurementPlan.do?menuId=EB03010100&leftTopFlag=t"
+
+        # Toutes les pages sont telechargees en parallele, puis parsees dans l'ordre des sources
+        jao_items = list(jao_categories.items())
+        pages = self._fetch_pages(
+            [(url, 30) for _, url in jao_items] + [(self.base_url, 10), (telemo_plan_url, 30)]
+        )
+        jao_pages, dgcmp_page, telemo_page = pages[:len(jao_items)], pages[-2], pages[-1]
+
+        for (cat, _), page in zip(jao_items, jao_pages):
             try:
-                html = self._fetch_page(url)
-                tender_data_list = self._parse_jao_listings(html, category=cat)
+                if isinstance(page, Exception):
+                    raise page
+                html, encoding = page
+                tender_data_list = self._parse_jao_listings(html, category=cat, encoding=encoding)
                 all_tender_data.extend(tender_data_list)
             except Exception as e:
                 logger.warning(f"Echec scraping JAO {cat}: {e}")
 
-        # Source 2 : DGCMP
         try:
-            html = self._fetch_page(self.base_url, timeout=10)
-            all_tender_data.extend(self._parse_dgcmp_listings(html))
+            if isinstance(dgcmp_page, Exception):
+                raise dgcmp_page
+            all_tender_data.extend(self._parse_dgcmp_listings(*dgcmp_page))
         except Exception:
             logger.info("DGCMP est toujours indisponible")
 
-        # Source 3 : Telemo
         try:
-            telemo_plan_url = f"{self.telemo_url}/eb/bpp/selectPageProcurementPlan.do?menuId=EB03010100&leftTopFlag=t"
-            html = self._fetch_page(telemo_plan_url)
-            all_tender_data.extend(self._parse_telemo_listings(html))
+            if isinstance(telemo_page, Exception):
+                raise telemo_page
+            all_tender_data.extend(self._parse_telemo_listings(*telemo_page))
         except Exception as e:
             logger.warning(f"Echec scraping Telemo: {e}")
 
         # Deduplication et Stockage
-        seen_urls = set()
-        unique_tenders = []
+        # Une seule table de hachage ; la première occurrence d'une URL l'emporte
+        unique_by_url: dict[str, dict] = {}
         for td in all_tender_data:
-            if td["source_url"] not in seen_urls:
-                seen_urls.add(td["source_url"])
-                unique_tenders.append(td)
+            unique_by_url.setdefault(td["source_url"], td)
+        unique_tenders = list(unique_by_url.values())
+
+        existing_urls = self._existing_source_urls(list(unique_by_url))
 
         for tender_data in unique_tenders:
-            try:
-                if self._tender_exists(tender_data["source_url"]):
-                    continue
-
-                tender = Tender(
-                    title=tender_data["title"],
-                    description=tender_data.get("description"),
-                    source_url=tender_data["source_url"],
-                    sector=tender_data.get("sector"),
-                    location=tender_data.get("location", "Guinee"),
-                    is_analyzed=False,
-                )
-
-                self.db.add(tender)
-                self.db.flush()
-                new_tenders.append(tender)
+            if tender_data["source_url"] in existing_urls:
+                continue
+
+            new_tenders.append(Tender(
+                title=tender_data["title"],
+                description=tender_data.get("description"),
+                source_url=tender_data["source_url"],
+                sector=tender_data.get("sector"),
+                location=tender_data.get("location", "Guinee"),
+                is_analyzed=False,
+            ))
+
+        if new_tenders:
+            new_tenders = self._insert_tenders(new_tenders)
+            for tender in new_tenders:
                 logger.info(f"Nouveau tender #{tender.id}: {tender.title[:60]}")
 
-            except Exception as e:
-                logger.error(f"Erreur tender '{tender_data.get('title')}': {e}")
-                continue
+        # PDF référencés directement par les annonces (relevés avant le commit,
+        # qui expire les attributs des objets)
+        pdf_targets = [(t.id, t.source_url) for t in new_tenders if t.source_url.lower().endswith(".pdf")]
 
+        # Les tenders sont validés avant la phase réseau : la transaction d'insertion
+        # ne reste pas ouverte pendant les téléchargements, et un échec de ceux-ci
+        # ne fait pas perdre le scraping
         self.db.commit()
+
+        # Téléchargement parallèle, puis pdf_path écrit dans une seconde transaction courte
+        if pdf_targets:
+            pdf_paths = self.download_pdfs([url for _, url in pdf_targets])
+            updates = [
+                {"id": tender_id, "pdf_path": pdf_path}
+                for (tender_id, _), pdf_path in zip(pdf_targets, pdf_paths)
+                if pdf_path
+            ]
+            if updates:
+                self.db.bulk_update_mappings(Tender, updates)
+                self.db.commit()
+
         logger.info(f"Scraping termine: {len(new_tenders)} nouveaux ({len(jao_categories)} categories scrapees)")
         return new_tenders
\ No newline at end of file
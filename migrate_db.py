@@ -27,4 +27,14 @@ with engine.connect() as conn:
     conn.commit()
     print("OK: table subscriptions créée")
 
+    # Index composites pour le scoring et les rapports
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_tenders_is_analyzed_id ON tenders (is_analyzed, id)"
+    ))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_analyses_enterprise_id_score ON analyses (enterprise_id, score)"
+    ))
+    conn.commit()
+    print("OK: index composites créés")
+
 print("Migration terminée avec succès!")
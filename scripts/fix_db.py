@@ -17,18 +17,19 @@ def migrate():
         ("technical_capacity", "TEXT")
     ]
     
-    with engine.connect() as conn:
-        for column_name, column_type in columns_to_add:
-            print(f"⌛ Tentative d'ajout de la colonne '{column_name}'...")
-            try:
-                # PostgreSQL ALTER TABLE ADD COLUMN IF NOT EXISTS (PG 9.6+)
-                query = text(f"ALTER TABLE enterprises ADD COLUMN IF NOT EXISTS {column_name} {column_type};")
-                conn.execute(query)
-                conn.commit()
-                print(f"✅ Colonne '{column_name}' ajoutée ou déjà présente.")
-            except Exception as e:
-                print(f"❌ Erreur lors de l'ajout de '{column_name}': {e}")
-                conn.rollback()
+    # Une seule instruction ALTER TABLE (un seul verrou) dans une seule transaction
+    # PostgreSQL ALTER TABLE ADD COLUMN IF NOT EXISTS (PG 9.6+)
+    clauses = ", ".join(
+        f"ADD COLUMN IF NOT EXISTS {column_name} {column_type}"
+        for column_name, column_type in columns_to_add
+    )
+    print(f"⌛ Tentative d'ajout des colonnes : {', '.join(name for name, _ in columns_to_add)}...")
+    try:
+        with engine.begin() as conn:
+            conn.execute(text(f"ALTER TABLE enterprises {clauses};"))
+        print(f"✅ {len(columns_to_add)} colonnes ajoutées ou déjà présentes.")
+    except Exception as e:
+        print(f"❌ Erreur lors de l'ajout des colonnes : {e}")
 
     print("✨ Migration terminée !")
 
@@ -1,9 +1,12 @@
 # scripts/init_db.py
+# Usage (depuis la racine du projet) : python -m scripts.init_db
 import sys
-import os
 
-# Ajouter le dossier parent au path pour importer 'app'
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if not __package__:
+    # Compatibilite : lance directement (python scripts/init_db.py),
+    # le dossier parent doit etre ajoute au path pour importer 'app'
+    import os
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.database import init_db
 from app.config import get_settings
@@ -1,92 +1,285 @@
+import io
 import os
 import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from xml.sax.saxutils import escape
 from docx import Document
-from docx.shared import Pt, RGBColor
-from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.shared import Emu, Pt
 
-def convert_md_to_docx(md_path, docx_path):
+def _plain_part(text):
+    # Un segment non gras qui commence ET finit par ** est rendu en gras (comme
+    # l'ancien test startswith/endswith). Cela ne vaut que si ce reste forme tout
+    # le segment, ex: la ligne entiere '**a*b**' ; au milieu d'une ligne
+    # ('x **a*b** y') les ** restent du texte litteral.
+    if text.startswith('**') and text.endswith('**'):
+        return True, text[2:-2]
+    return False, text
+
+def _iter_bold_parts(line):
+    """
+    Decoupe une ligne en segments (gras, texte) sans passer par une regex.
+    Un segment en gras est un **texte** non vide sans '*' ; les segments
+    normaux sont rendus tels quels, y compris vides, comme un re.split.
+
+    Compromis assume pour ce sous-ensemble de Markdown : une paire ** ne
+    s'etend jamais au-dela d'un '*' isole, donc pas de retour arriere sur
+    une ligne aux ** desequilibres. Consequence visible : un gras contenant
+    un '*' (ex: 'x **a*b** y' ou '**prix *HT* total**' en milieu de ligne)
+    reste en texte brut, avec ses asterisques.
+
+    Un candidat rejete fait repartir la recherche apres ce '*', chaque
+    caractere n'est lu qu'un nombre borne de fois : temps lineaire quelle
+    que soit l'entree.
+    """
+    pos = start = 0
+    while True:
+        i = line.find('**', start)
+        if i < 0:
+            break
+        j = line.find('*', i + 2)
+        if j < 0:
+            break
+        if j > i + 2 and line.startswith('*', j + 1):
+            yield _plain_part(line[pos:i])
+            yield True, line[i + 2:j]
+            pos = start = j + 2
+        else:
+            start = i + 1
+    yield _plain_part(line[pos:])
+
+def _load_template():
+    """
+    Charge une seule fois le modele python-docx (style Normal en Calibri 11)
+    et le decoupe : parties de l'archive recopiees telles quelles, debut et
+    fin de word/document.xml autour du corps, identifiants de styles et
+    largeur utile de la page.
+    """
     doc = Document()
-    
+
     # Configuration du style par défaut
     style = doc.styles['Normal']
     font = style.font
     font.name = 'Calibri'
     font.size = Pt(11)
 
-    if not os.path.exists(md_path):
+    style_ids = {name: doc.styles[name].style_id for name in _STYLE_NAMES}
+    # Largeur utile de la page (API publique des sections, comme add_table)
+    section = doc.sections[0]
+    block_width = Emu(section.page_width - section.left_margin - section.right_margin)
+
+    buf = io.BytesIO()
+    doc.save(buf)
+    with zipfile.ZipFile(buf) as z:
+        parts = [(name, z.read(name)) for name in z.namelist()]
+    document_xml = dict(parts)[_DOCUMENT_PART]
+    # Le corps du modele ne contient que <w:sectPr>, qui doit rester en dernier
+    split = document_xml.index(b'<w:sectPr')
+    return parts, document_xml[:split], document_xml[split:], style_ids, block_width
+
+_DOCUMENT_PART = 'word/document.xml'
+
+_HEADING_STYLES = ('Title', 'Heading 1', 'Heading 2')
+_STYLE_NAMES = _HEADING_STYLES + ('List Bullet', 'Quote', 'Table Grid')
+
+# Modele charge une seule fois, reutilise pour chaque conversion
+_PARTS, _BODY_HEAD, _BODY_TAIL, _STYLE_IDS, _BLOCK_WIDTH = _load_template()
+
+# Caracteres refuses par XML 1.0 (lxml levait ValueError sur ces textes)
+_INVALID_XML_RE = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]')
+
+def _run_xml(text, bold=False):
+    """
+    XML d'un <w:r>, comme p.add_run(text) / cell.text dans python-docx :
+    les tabulations deviennent des <w:tab/>, les blancs en bordure sont
+    preserves.
+    """
+    if _INVALID_XML_RE.search(text):
+        raise ValueError(f"Caractere non valide en XML dans : {text!r}")
+    xml = ['<w:r>']
+    if bold:
+        xml.append('<w:rPr><w:b/></w:rPr>')
+    for k, piece in enumerate(text.split('\t')):
+        if k:
+            xml.append('<w:tab/>')
+        if piece:
+            if piece.strip() != piece:
+                xml.append('<w:t xml:space="preserve">')
+            else:
+                xml.append('<w:t>')
+            xml.append(escape(piece))
+            xml.append('</w:t>')
+    if len(xml) == 1:
+        return '<w:r/>'
+    xml.append('</w:r>')
+    return ''.join(xml)
+
+def _paragraph_xml(text, style_id, center=False):
+    # Equivalent de doc.add_paragraph(text, style) (+ alignement centre)
+    jc = '<w:jc w:val="center"/>' if center else ''
+    run = _run_xml(text) if text else ''
+    return f'<w:p><w:pPr><w:pStyle w:val="{style_id}"/>{jc}</w:pPr>{run}</w:p>'
+
+_HEAD_RE = re.compile(r'#{1,3} ')
+
+def _heading(body, line):
+    # '# ', '## ' ou '### ' : le niveau est donne par le nombre de '#'
+    m = _HEAD_RE.match(line)
+    if m is None:
+        return False
+    level = m.end() - 2  # m couvre les '#' et l'espace
+    body.append(_paragraph_xml(line[m.end():], _STYLE_IDS[_HEADING_STYLES[level]], level == 0))
+    return True
+
+def _page_break(body, line):
+    if not line.startswith('---'):
+        return False
+    body.append('<w:p><w:r><w:br w:type="page"/></w:r></w:p>')
+    return True
+
+def _bullet(body, line):
+    body.append(_paragraph_xml(line[2:], _STYLE_IDS['List Bullet']))
+    return True
+
+def _quote(body, line):
+    body.append(_paragraph_xml(line[2:], _STYLE_IDS['Quote']))
+    return True
+
+# Traitement des lignes speciales, indexe par leurs deux premiers caracteres
+# (un seul lookup par ligne au lieu d'une cascade de startswith)
+_PREFIX_HANDLERS = {
+    '# ': _heading,
+    '##': _heading,
+    '--': _page_break,
+    '* ': _bullet,
+    '> ': _quote,
+}
+
+def _text_paragraph_xml(line):
+    if '**' not in line:
+        # Cas le plus courant : pas de gras, un seul run
+        return f'<w:p>{_run_xml(line)}</w:p>'
+    runs = ''.join(_run_xml(text, bold) for bold, text in _iter_bold_parts(line))
+    return f'<w:p>{runs}</w:p>'
+
+# Proprietes communes a tous les tableaux : memes valeurs que
+# doc.add_table() + table.style = 'Table Grid'
+_TBL_PR = (
+    f'<w:tblPr><w:tblStyle w:val="{_STYLE_IDS["Table Grid"]}"/>'
+    '<w:tblW w:type="auto" w:w="0"/>'
+    '<w:tblLook w:firstColumn="1" w:firstRow="1" w:lastColumn="0" w:lastRow="0"'
+    ' w:noHBand="0" w:noVBand="1" w:val="04A0"/>'
+    '</w:tblPr>'
+)
+
+def _table_xml(table_data, cols):
+    """
+    XML <w:tbl> du tableau, identique a celui produit par doc.add_table()
+    puis table.cell(i, j).text = ... pour chaque cellule. Toutes les
+    lignes ont deja exactement `cols` cellules.
+    """
+    width = '%d' % Emu(_BLOCK_WIDTH // cols).twips
+    tc_pr = f'<w:tcPr><w:tcW w:type="dxa" w:w="{width}"/></w:tcPr>'
+    xml = ['<w:tbl>', _TBL_PR, '<w:tblGrid>']
+    xml.extend(f'<w:gridCol w:w="{width}"/>' for _ in range(cols))
+    xml.append('</w:tblGrid>')
+    for row_data in table_data:
+        xml.append('<w:tr>')
+        for text in row_data:
+            if text:
+                xml.append(f'<w:tc>{tc_pr}<w:p>{_run_xml(text)}</w:p></w:tc>')
+            else:
+                xml.append(f'<w:tc>{tc_pr}<w:p/></w:tc>')
+        xml.append('</w:tr>')
+    xml.append('</w:tbl>')
+    return ''.join(xml)
+
+def _write_docx(docx_path, body):
+    """
+    Assemble l'archive : parties du modele recopiees, word/document.xml
+    genere a partir des fragments XML du corps.
+    """
+    document_xml = _BODY_HEAD + ''.join(body).encode('utf-8') + _BODY_TAIL
+    # Archive construite en memoire puis ecrite en une seule fois
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, 'w', zipfile.ZIP_DEFLATED) as z:
+        for name, data in _PARTS:
+            z.writestr(name, document_xml if name == _DOCUMENT_PART else data)
+    with open(docx_path, 'wb') as out:
+        out.write(buf.getbuffer())
+
+def convert_md_to_docx(md_path, docx_path):
+    # Ouverture directe plutot que os.path.exists() + open() (un seul appel
+    # systeme, pas de fenetre entre la verification et l'ouverture)
+    try:
+        f = open(md_path, 'r', encoding='utf-8')
+    except FileNotFoundError:
         print(f"Erreur : Le fichier {md_path} n'existe pas.")
         return
 
-    with open(md_path, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
+    # Fragments XML du corps du document, dans l'ordre
+    body = []
 
     in_table = False
     table_data = []
+    cols = 0
 
-    for line in lines:
-        line = line.strip('\n')
+    # Lecture ligne a ligne : le fichier n'est jamais charge en entier
+    with f:
+        for line in f:
+            line = line.rstrip('\n')
         
-        # Gestion des tableaux Markdown
-        if '|' in line and '---' not in line:
-            in_table = True
-            cells = [c.strip() for c in line.split('|') if c.strip()]
-            if cells:
-                table_data.append(cells)
-            continue
-        elif in_table and ('---' in line or not line.strip()):
-            if not line.strip() and table_data:
-                # Fin du tableau, on l'écrit
-                table = doc.add_table(rows=len(table_data), cols=len(table_data[0]))
-                table.style = 'Table Grid'
-                for i, row_data in enumerate(table_data):
-                    for j, cell_data in enumerate(row_data):
-                        table.cell(i, j).text = cell_data
-                table_data = []
-                in_table = False
-            continue
-        elif in_table and not '|' in line:
-             in_table = False
-             table_data = []
-
-        # Titres
-        if line.startswith('# '):
-            p = doc.add_heading(line[2:], level=0)
-            p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        elif line.startswith('## '):
-            p = doc.add_heading(line[3:], level=1)
-        elif line.startswith('### '):
-            p = doc.add_heading(line[4:], level=2)
-        elif line.startswith('---'):
-            doc.add_page_break()
-        elif line.startswith('* '):
-            p = doc.add_paragraph(line[2:], style='List Bullet')
-        elif line.startswith('> '):
-            p = doc.add_paragraph(line[2:])
-            p.style = 'Quote'
-        elif line.strip():
-            # Texte normal avec gestion du gras simples
-            p = doc.add_paragraph()
-            parts = re.split(r'(\*\*.*?\*\*)', line)
-            for part in parts:
-                if part.startswith('**') and part.endswith('**'):
-                    run = p.add_run(part[2:-2])
-                    run.bold = True
-                else:
-                    p.add_run(part)
-        else:
-            doc.add_paragraph()
+            # Caracteristiques de la ligne, calculees une seule fois
+            has_pipe = '|' in line
+            is_rule = '---' in line
+
+            # Gestion des tableaux Markdown
+            if has_pipe and not is_rule:
+                in_table = True
+                cells = [c for c in map(str.strip, line.split('|')) if c]
+                if cells:
+                    if not table_data:
+                        # La premiere ligne fixe le nombre de colonnes
+                        cols = len(cells)
+                    elif len(cells) != cols:
+                        # Ligne irreguliere : completee ou tronquee
+                        cells = cells[:cols] + [''] * (cols - len(cells))
+                    table_data.append(cells)
+                continue
+
+            blank = not line or line.isspace()
+            if in_table and (is_rule or blank):
+                if blank and table_data:
+                    # Fin du tableau, on l'écrit
+                    body.append(_table_xml(table_data, cols))
+                    table_data = []
+                    in_table = False
+                continue
+            elif in_table and not has_pipe:
+                 in_table = False
+                 table_data = []
+
+            # Titres, saut de page, listes et citations
+            handler = _PREFIX_HANDLERS.get(line[:2])
+            if handler is not None and handler(body, line):
+                continue
+            if not blank:
+                # Texte normal avec gestion du gras simples
+                body.append(_text_paragraph_xml(line))
+            else:
+                body.append('<w:p/>')
 
     # Si un tableau était en cours à la fin du fichier
     if table_data:
-        table = doc.add_table(rows=len(table_data), cols=len(table_data[0]))
-        table.style = 'Table Grid'
-        for i, row_data in enumerate(table_data):
-            for j, cell_data in enumerate(row_data):
-                table.cell(i, j).text = cell_data
+        body.append(_table_xml(table_data, cols))
 
-    doc.save(docx_path)
+    _write_docx(docx_path, body)
     print(f"Succès : {docx_path} généré.")
 
+def _convert_pair(paths):
+    # Point d'entree picklable pour le pool de processus
+    convert_md_to_docx(*paths)
+
 if __name__ == "__main__":
     # Définir les chemins
     base_dir = r"C:\Users\LUXE\.gemini\antigravity\brain\b341945e-f7b3-4b03-a927-51136d2faec0"
@@ -97,7 +290,10 @@ if __name__ == "__main__":
         ("analyse_roi_tarification.md", "Analyse_ROI_AlertesPME.docx")
     ]
     
-    for md_name, docx_name in files_to_convert:
-        md_p = os.path.join(base_dir, md_name)
-        docx_p = os.path.join(output_dir, docx_name)
-        convert_md_to_docx(md_p, docx_p)
+    jobs = [
+        (os.path.join(base_dir, md_name), os.path.join(output_dir, docx_name))
+        for md_name, docx_name in files_to_convert
+    ]
+    # Conversions independantes : un processus par fichier
+    with ProcessPoolExecutor(max_workers=min(len(jobs), os.cpu_count() or 1)) as executor:
+        list(executor.map(_convert_pair, jobs))
@@ -39,6 +39,7 @@ CREATE INDEX IF NOT EXISTS ix_tenders_id ON tenders (id);
 CREATE INDEX IF NOT EXISTS ix_tenders_title ON tenders (title);
 CREATE INDEX IF NOT EXISTS ix_tenders_sector ON tenders (sector);
 CREATE INDEX IF NOT EXISTS ix_tenders_is_analyzed ON tenders (is_analyzed);
+CREATE INDEX IF NOT EXISTS ix_tenders_is_analyzed_id ON tenders (is_analyzed, id);
 
 -- 3. Analyses
 CREATE TABLE IF NOT EXISTS analyses (
@@ -59,6 +60,7 @@ CREATE TABLE IF NOT EXISTS analyses (
 CREATE INDEX IF NOT EXISTS ix_analyses_id ON analyses (id);
 CREATE INDEX IF NOT EXISTS ix_analyses_tender_id ON analyses (tender_id);
 CREATE INDEX IF NOT EXISTS ix_analyses_enterprise_id ON analyses (enterprise_id);
+CREATE INDEX IF NOT EXISTS ix_analyses_enterprise_id_score ON analyses (enterprise_id, score);
 
 -- 4. Email Logs
 CREATE TABLE IF NOT EXISTS email_logs (
@@ -0,0 +1,79 @@
+# tests/test_email_service.py
+"""
+Tests de non-regression du formatage des emails : paliers de score et
+correction du double-encodage, compares aux anciennes implementations.
+"""
+
+import unittest
+
+from app.services.email_service import EmailService, _score_bucket
+
+
+def _reference_bucket(score):
+    """Anciennes expressions conditionnelles de _build_html_body."""
+    return (
+        "#27ae60" if score >= 70 else "#f39c12" if score >= 40 else "#e74c3c",
+        "Excellent" if score >= 70 else "Moyen" if score >= 40 else "A surveiller",
+        "#e8f5e9" if score >= 70 else "#fff8e1" if score >= 40 else "#fce4ec",
+        "#1b5e20" if score >= 70 else "#e65100" if score >= 40 else "#b71c1c",
+    )
+
+
+def _reference_fix_encoding(text):
+    """Ancien _fix_encoding : un replace par entree du tableau (doublons compris)."""
+    if not text:
+        return ""
+    try:
+        fixed = text.encode('latin-1').decode('utf-8')
+        if fixed != text:
+            return fixed
+    except (UnicodeDecodeError, UnicodeEncodeError):
+        pass
+    replacements = {
+        '\u00c3\u00a9': 'é', '\u00c3\u00a8': 'è', '\u00c3\u00aa': 'ê',
+        '\u00c3\u00ab': 'ë', '\u00c3\u00a0': 'à', '\u00c3\u00a2': 'â',
+        '\u00c3\u00a7': 'ç', '\u00c3\u00b4': 'ô', '\u00c3\u00b9': 'ù',
+        '\u00c3\u00bb': 'û', '\u00c3\u00ae': 'î', '\u00c3\u00af': 'ï',
+        'Ã©': 'é', 'Ã¨': 'è', 'Ãª': 'ê', 'Ã«': 'ë',
+        'Ã ': 'à', 'Ã¢': 'â', 'Ã§': 'ç', 'Ã´': 'ô',
+        'Ã¹': 'ù', 'Ã»': 'û', 'Ã®': 'î', 'Ã¯': 'ï',
+        'â\x80\x99': "'", 'â\x80\x93': '-', 'â\x80\x94': '-',
+        '\u2019': "'", '\u00e2\u0080\u0099': "'",
+    }
+    for bad, good in replacements.items():
+        text = text.replace(bad, good)
+    return text
+
+
+class ScoreBucketTest(unittest.TestCase):
+
+    def test_buckets_match_conditionals(self):
+        scores = [-5, 0, 0.1, 39.9, 39.99, 40, 40.0001, 55, 69.9, 69.95, 70, 70.1, 99.9, 100, 130]
+        for score in scores:
+            with self.subTest(score=score):
+                self.assertEqual(_score_bucket(score)[1:], _reference_bucket(score))
+
+
+class FixEncodingTest(unittest.TestCase):
+
+    def test_matches_sequential_replacements(self):
+        service = EmailService(db=None)
+        samples = [
+            "",
+            "Marché public",
+            "MarchÃ© public Ã  Conakry",
+            "Ã  la une – l’appel",
+            "â\x80\x99 â\x80\x93 â\x80\x94 Ã¢Ã§Ã´Ã¹Ã»Ã®Ã¯Ã«ÃªÃ¨",
+            "Ã© mélangé à du texte correct",
+            "€ Ã© ’",
+            "’ Ã\u00a0 la Ã  la Ã\u00a0",
+            "Ã\u00a0 seul",
+            "texte ascii",
+        ]
+        for text in samples:
+            with self.subTest(text=text):
+                self.assertEqual(service._fix_encoding(text), _reference_fix_encoding(text))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,171 @@
+# tests/test_md_to_docx.py
+"""
+Tests de non-regression de scripts/md_to_docx.py : le word/document.xml
+genere directement doit etre identique a celui que produisait l'ancienne
+conversion par l'API python-docx.
+"""
+
+import contextlib
+import io
+import os
+import random
+import re
+import tempfile
+import unittest
+import zipfile
+
+from lxml import etree
+
+try:
+    from docx import Document
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    from docx.shared import Pt
+    from scripts import md_to_docx
+except ImportError:  # python-docx n'est utile qu'a ce script
+    md_to_docx = None
+
+
+# Gras : '**' + texte non vide sans '*' + '**' (motif resserre, voir _iter_bold_parts)
+_BOLD_SPLIT_RE = re.compile(r'(\*\*[^*]+?\*\*)')
+
+
+def _reference_bold_parts(line):
+    """Decoupage de reference : re.split puis test startswith/endswith."""
+    for part in _BOLD_SPLIT_RE.split(line):
+        if part.startswith('**') and part.endswith('**'):
+            yield True, part[2:-2]
+        else:
+            yield False, part
+
+
+def _reference_table(doc, table_data):
+    cols = len(table_data[0])
+    table = doc.add_table(rows=len(table_data), cols=cols)
+    table.style = 'Table Grid'
+    for i, row_data in enumerate(table_data):
+        # Lignes irregulieres : cellules en trop ignorees, manquantes laissees vides
+        for j, cell_data in enumerate(row_data[:cols]):
+            table.cell(i, j).text = cell_data
+
+
+def _reference_convert(md_text, docx_path):
+    """
+    Ancienne conversion par l'API python-docx, avec les deux changements voulus
+    depuis : motif de gras resserre et lignes de tableau irregulieres normalisees.
+    """
+    doc = Document()
+    font = doc.styles['Normal'].font
+    font.name = 'Calibri'
+    font.size = Pt(11)
+
+    in_table = False
+    table_data = []
+    for line in io.StringIO(md_text).readlines():
+        line = line.strip('\n')
+        if '|' in line and '---' not in line:
+            in_table = True
+            cells = [c.strip() for c in line.split('|') if c.strip()]
+            if cells:
+                table_data.append(cells)
+            continue
+        elif in_table and ('---' in line or not line.strip()):
+            if not line.strip() and table_data:
+                _reference_table(doc, table_data)
+                table_data = []
+                in_table = False
+            continue
+        elif in_table and '|' not in line:
+            in_table = False
+            table_data = []
+
+        if line.startswith('# '):
+            p = doc.add_heading(line[2:], level=0)
+            p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        elif line.startswith('## '):
+            doc.add_heading(line[3:], level=1)
+        elif line.startswith('### '):
+            doc.add_heading(line[4:], level=2)
+        elif line.startswith('---'):
+            doc.add_page_break()
+        elif line.startswith('* '):
+            doc.add_paragraph(line[2:], style='List Bullet')
+        elif line.startswith('> '):
+            p = doc.add_paragraph(line[2:])
+            p.style = 'Quote'
+        elif line.strip():
+            p = doc.add_paragraph()
+            for bold, text in _reference_bold_parts(line):
+                run = p.add_run(text)
+                if bold:
+                    run.bold = True
+        else:
+            doc.add_paragraph()
+
+    if table_data:
+        _reference_table(doc, table_data)
+    doc.save(docx_path)
+
+
+def _document_xml(docx_path):
+    with zipfile.ZipFile(docx_path) as z:
+        return etree.tostring(etree.fromstring(z.read('word/document.xml')), method='c14n')
+
+
+SAMPLES = [
+    "# Titre\n## Sous-titre\n### Section\nTexte **gras** et normal.\n",
+    "**tout en gras**\n**a*b**\nx **a*b** y\n**prix *HT* total**\n** **\n****\n",
+    "* puce\n> citation\n---\ntexte\n\n\ttabulation\t\n  blancs en bordure  \n<&>\n",
+    "| A | B | C |\n|---|---|---|\n| 1 | 2 | 3 |\n| 4 | 5 |\n| 6 | 7 | 8 | 9 |\n\napres\n",
+    "| seul |\n| x |\ntexte sans pipe\n| fin | de | fichier |",
+    "#pas un titre\n#### quatre\n--\n- tiret\n*pas une puce\n",
+]
+
+_TOKENS = ['# ', '## ', '### ', '#', '---', '* ', '> ', '|', ' | ', '**', '*',
+           'a', 'é', ' ', '', 'x y', '<&>', '\t', '-', '|---|', ':']
+
+
+@unittest.skipIf(md_to_docx is None, "python-docx non installe")
+class MdToDocxTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def _assert_same_document(self, md_text):
+        md_path = os.path.join(self.tmp.name, 'in.md')
+        with open(md_path, 'w', encoding='utf-8') as f:
+            f.write(md_text)
+        new_path = os.path.join(self.tmp.name, 'new.docx')
+        ref_path = os.path.join(self.tmp.name, 'ref.docx')
+        with contextlib.redirect_stdout(io.StringIO()):
+            md_to_docx.convert_md_to_docx(md_path, new_path)
+        _reference_convert(md_text, ref_path)
+        self.assertEqual(_document_xml(new_path), _document_xml(ref_path), md_text)
+
+    def test_bold_parts_match_regex_split(self):
+        rng = random.Random(0)
+        lines = [line for sample in SAMPLES for line in sample.split('\n')]
+        lines += [''.join(rng.choice(['**', '*', 'a', ' ', 'b*', '***']) for _ in range(rng.randint(0, 12)))
+                  for _ in range(500)]
+        for line in lines:
+            with self.subTest(line=line):
+                self.assertEqual(list(md_to_docx._iter_bold_parts(line)),
+                                 list(_reference_bold_parts(line)))
+
+    def test_samples_match_python_docx(self):
+        for md_text in SAMPLES:
+            with self.subTest(md_text=md_text):
+                self._assert_same_document(md_text)
+
+    def test_random_documents_match_python_docx(self):
+        rng = random.Random(1)
+        for _ in range(60):
+            lines = [''.join(rng.choice(_TOKENS) for _ in range(rng.randint(0, 6)))
+                     for _ in range(rng.randint(0, 15))]
+            md_text = '\n'.join(lines) + rng.choice(['', '\n'])
+            with self.subTest(md_text=md_text):
+                self._assert_same_document(md_text)
+
+
+if __name__ == "__main__":
+    unittest.main()
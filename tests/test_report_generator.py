@@ -0,0 +1,37 @@
+# tests/test_report_generator.py
+"""
+Tests de non-regression du rapport : resume des scores calcule en une passe.
+"""
+
+import random
+import unittest
+
+from app.services.report_generator import _score_summary
+
+
+def _reference_summary(scored):
+    """Anciennes comprehensions de generate_enterprise_report."""
+    if not scored:
+        return 0, 0, 0, 0.0
+    return (
+        len([s for s in scored if s["score"] >= 70]),
+        len([s for s in scored if 40 <= s["score"] < 70]),
+        len([s for s in scored if s["score"] < 40]),
+        round(sum(s["score"] for s in scored) / len(scored), 1),
+    )
+
+
+class ScoreSummaryTest(unittest.TestCase):
+
+    def test_matches_comprehensions(self):
+        rng = random.Random(0)
+        cases = [[], [{"score": 70.0}], [{"score": 40.0}, {"score": 39.9}, {"score": 0.0}]]
+        cases += [[{"score": round(rng.uniform(0, 100), 1)} for _ in range(rng.randint(1, 300))]
+                  for _ in range(50)]
+        for scored in cases:
+            with self.subTest(size=len(scored)):
+                self.assertEqual(_score_summary(scored), _reference_summary(scored))
+
+
+if __name__ == "__main__":
+    unittest.main()
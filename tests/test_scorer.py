@@ -0,0 +1,115 @@
+# tests/test_scorer.py
+"""
+Tests de non-regression du scoring : les chemins acceleres doivent donner
+exactement les memes resultats que le chemin Python pur.
+"""
+
+import dataclasses
+import unittest
+
+from app.models.enterprise import Enterprise
+from app.models.tender import Tender
+from app.services import scorer as scorer_module
+from app.services.scorer import ScorerService
+from app.services.scorer_kernels import budget_score, budget_scores
+
+
+TEXTS = [
+    "",
+    "fourniture de logiciel de gestion",
+    "travaux de construction d'une route a conakry",
+    "logiciel, reseau et maintenance informatique",
+    "achat d'armement leger",
+    "logiciels reseaux logiciel",
+    "log",
+    "maintenance du reseau electrique et logiciel de supervision armement",
+]
+
+
+def _enterprise(**kwargs) -> Enterprise:
+    values = dict(
+        id=1, name="Test", sector="Informatique", min_budget=1e6, max_budget=5e8,
+        zones="Conakry, Kindia", experience_years=6,
+        specific_keywords="logiciel, reseau, log, logiciel", exclude_keywords="armement",
+    )
+    values.update(kwargs)
+    return Enterprise(**values)
+
+
+class KeywordScanTest(unittest.TestCase):
+
+    @unittest.skipIf(scorer_module.ahocorasick is None, "pyahocorasick non installe")
+    def test_automaton_matches_substring_scan(self):
+        scorer = ScorerService(db=None)
+        for kwargs in (
+            {},
+            {"exclude_keywords": None},
+            {"specific_keywords": "reseau", "exclude_keywords": "reseau"},
+            {"specific_keywords": "a, b, c, d, e", "exclude_keywords": ""},
+        ):
+            ctx = scorer.build_context(_enterprise(**kwargs))
+            if not ctx.exclude_keywords and not ctx.specific_keywords:
+                continue
+            self.assertIsNotNone(ctx.keyword_automaton)
+            plain = dataclasses.replace(ctx, keyword_automaton=None)
+            for text in TEXTS:
+                with self.subTest(kwargs=kwargs, text=text):
+                    self.assertEqual(
+                        scorer._keyword_score(ctx, text),
+                        scorer._keyword_score(plain, text),
+                    )
+
+    def test_no_automaton_without_keywords(self):
+        ctx = ScorerService(db=None).build_context(
+            _enterprise(specific_keywords=None, exclude_keywords=None)
+        )
+        self.assertIsNone(ctx.keyword_automaton)
+        self.assertEqual(ScorerService(db=None)._keyword_score(ctx, "logiciel"), 1.0)
+
+
+def _reference_budget_score(min_budget, max_budget, estimated_budget):
+    """Ancien ScorerService._budget_score."""
+    if not estimated_budget or estimated_budget <= 0:
+        return 0.5
+    if min_budget <= 0 and max_budget <= 0:
+        return 0.5
+    if min_budget <= estimated_budget <= max_budget:
+        return 1.0
+    if max_budget > 0 and estimated_budget > max_budget:
+        return max(0.1, max_budget / estimated_budget)
+    if min_budget > 0 and estimated_budget < min_budget:
+        return max(0.1, estimated_budget / min_budget)
+    return 0.5
+
+
+class BudgetScoreTest(unittest.TestCase):
+
+    def test_batch_matches_per_tender_score(self):
+        estimated = [None, 0, -1, 1, 5e5, 1e6, 2e7, 5e8, 5e8 + 1, 9e8, 1e12]
+        for min_budget, max_budget in [(0, 0), (1e6, 5e8), (0, 5e8), (1e6, 0), (5e8, 1e6), (-1, 1e6)]:
+            with self.subTest(min_budget=min_budget, max_budget=max_budget):
+                expected = [_reference_budget_score(min_budget, max_budget, e) for e in estimated]
+                self.assertEqual([budget_score(min_budget, max_budget, e) for e in estimated], expected)
+                self.assertEqual(budget_scores(min_budget, max_budget, estimated), expected)
+
+
+class CalculateScoreTest(unittest.TestCase):
+
+    def test_prebuilt_context_gives_same_score(self):
+        scorer = ScorerService(db=None)
+        enterprise = _enterprise()
+        ctx = scorer.build_context(enterprise)
+        for i, text in enumerate(TEXTS):
+            tender = Tender(
+                title=f"Tender {i}", raw_text=text, sector=["Informatique", "BTP", None][i % 3],
+                estimated_budget=[None, 2e7, 9e8][i % 3], location=["Conakry", "Boke", None][i % 3],
+            )
+            with self.subTest(text=text):
+                self.assertEqual(
+                    scorer.calculate_score(enterprise, tender, ctx=ctx),
+                    scorer.calculate_score(enterprise, tender),
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+# tests/test_scraper.py
+"""
+Tests de non-regression du scraper : recuperation des pages (avec et sans
+cache HTTP) et extraction du texte.
+"""
+
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from app.services import scraper as scraper_module
+
+try:
+    from bs4 import BeautifulSoup  # Ancien parseur, reference pour _text
+except ImportError:
+    BeautifulSoup = None
+from app.services.scraper import ScraperService
+
+
+PAGE = "<html><body><h1>Marché de sécurité</h1></body></html>".encode("cp1252")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    hits = 0
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        type(self).hits += 1
+        if self.path.endswith(".pdf"):
+            body, content_type = b"%PDF-1.4 test", "application/pdf"
+        else:
+            body, content_type = PAGE, "text/html; charset=windows-1252"
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def _scraper(session: requests.Session) -> ScraperService:
+    service = ScraperService.__new__(ScraperService)
+    service.session = session
+    return service
+
+
+class FetchPageTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_returns_bytes_and_header_charset(self):
+        content, encoding = _scraper(requests.Session())._fetch_page(f"{self.base}/page")
+        self.assertEqual(content, PAGE)
+        self.assertEqual(encoding, "cp1252")
+        root = scraper_module._parse_html(content, encoding)
+        self.assertEqual(scraper_module._text(root), "Marché de sécurité")
+
+    @unittest.skipIf(scraper_module.requests_cache is None, "requests-cache non installe")
+    def test_cached_session_matches_plain_session(self):
+        plain = _scraper(requests.Session())._fetch_page(f"{self.base}/cached")
+        cached_session = scraper_module.requests_cache.CachedSession(
+            backend="memory",
+            expire_after=scraper_module.PAGE_CACHE_EXPIRE,
+            filter_fn=scraper_module._is_html_response,
+        )
+        cached = _scraper(cached_session)
+
+        hits = _Handler.hits
+        self.assertEqual(cached._fetch_page(f"{self.base}/cached"), plain)
+        # Second appel servi par le cache, sans requete, avec le meme resultat
+        self.assertEqual(cached._fetch_page(f"{self.base}/cached"), plain)
+        self.assertEqual(_Handler.hits, hits + 1)
+
+        # Les PDF ne sont jamais mis en cache
+        cached_session.get(f"{self.base}/doc.pdf")
+        cached_session.get(f"{self.base}/doc.pdf")
+        self.assertEqual(_Handler.hits, hits + 3)
+
+
+TEXT_SAMPLES = [
+    "<table><tr><td> Avis  n°12 </td><td><a href='/x.pdf'>\n  Marché <b>public</b>\n</a></td></tr></table>",
+    "<div class='post'><h2> Titre <span>  avec </span> espaces </h2><p>Desc &amp; suite&nbsp;</p></div>",
+    "<div><script>var x = 1;</script>Texte<style>p {}</style><!-- commentaire --> visible</div>",
+    "<p>a<template>cache</template>b<ruby>漢<rp>(</rp><rt>kan</rt><rp>)</rp></ruby>c</p>",
+    "<article><h3>\t\n</h3><a href='#'>   </a><p>é à ç\u00a0</p></article>",
+    "<td><p>un</p><p>deux</p>trois<br/>quatre</td>",
+]
+_TEXT_TAGS = ("td", "a", "h2", "h3", "p", "div", "article", "span")
+
+
+class TextExtractionTest(unittest.TestCase):
+
+    @unittest.skipIf(BeautifulSoup is None, "beautifulsoup4 non installe")
+    def test_text_matches_get_text_strip(self):
+        for html in TEXT_SAMPLES:
+            root = scraper_module._parse_html(html)
+            soup = BeautifulSoup(html, "html.parser")
+            for tag in _TEXT_TAGS:
+                with self.subTest(html=html, tag=tag):
+                    expected = [el.get_text(strip=True) for el in soup.find_all(tag)]
+                    self.assertEqual([scraper_module._text(el) for el in root.iter(tag)], expected)
+
+
+if __name__ == "__main__":
+    unittest.main()